@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import types, configs
+from app.api.endpoints import types, configs, transfer, changes, debug
 
 api_router = APIRouter()
 
@@ -7,4 +7,8 @@ api_router = APIRouter()
 
 # API路由，不带前缀（因为前缀在main.py中添加）
 api_router.include_router(types.router, prefix="/types", tags=["types"])
-api_router.include_router(configs.router, prefix="/configs", tags=["configs"])
\ No newline at end of file
+# 导入导出路由需在 configs 之前注册，避免 /configs/{config_id} 先匹配
+api_router.include_router(transfer.router, prefix="/configs", tags=["configs"])
+api_router.include_router(configs.router, prefix="/configs", tags=["configs"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
\ No newline at end of file
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+from app.core import changelog
+from app.core.serialization import FastJSONResponse, rows_to_dicts
+from app.models.change import ConfigChange
+from app.models.database import get_read_db
+from app.schemas.change import ConfigChangeList
+
+router = APIRouter()
+
+_CHANGE_FIELDS = ("revision", "op", "type_name", "key", "value", "created_at")
+
+@router.get("", response_model=ConfigChangeList)
+async def get_changes(
+    since: int = Query(0, ge=0, description="客户端已同步到的变更版本号，首次同步传 0"),
+    limit: int = Query(1000, ge=1, le=10000, description="最多返回的变更条数"),
+    type_name: Optional[List[str]] = Query(None, description="只返回这些类型的变更，为空时返回全部"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    获取 since 之后的配置变更
+    
+    返回的 revision 作为下次请求的 since。since 早于已清理的记录时返回
+    full_sync_required，客户端应全量同步后从返回的 revision 继续。
+    """
+    # 先读取最新版本号，只返回不超过它的变更，避免跳过查询期间新提交的记录
+    head = await changelog.head_revision(db)
+    if since < await changelog.floor_revision(db, head):
+        return {"changes": [], "revision": head, "has_more": False, "full_sync_required": True}
+    
+    query = (
+        select(*(getattr(ConfigChange, name) for name in _CHANGE_FIELDS))
+        .where(ConfigChange.revision > since, ConfigChange.revision <= head)
+        .order_by(ConfigChange.revision)
+        .limit(limit + 1)
+    )
+    if type_name:
+        query = query.where(ConfigChange.type_name.in_(type_name))
+    result = await db.execute(query)
+    rows = result.all()
+    
+    has_more = len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+    revision = rows[-1].revision if has_more else max(head, since)
+    
+    return FastJSONResponse({
+        "changes": rows_to_dicts(_CHANGE_FIELDS, rows),
+        "revision": revision,
+        "has_more": has_more,
+        "full_sync_required": False
+    })
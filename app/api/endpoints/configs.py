@@ -1,232 +1,458 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from typing import List, Optional
-from app.models.database import get_db
+from sqlalchemy import select, and_, or_, tuple_, text, bindparam, DateTime
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
+from app.core import changelog
+from app.core.aggregates import aggregates
+from app.core.cache import config_cache
+from app.core.config import settings
+from app.core.etag import make_etag, not_modified
+from app.core.events import event_hub
+from app.core.pagination import CONFIG_FIELDS, fetch_config_page, parse_fields, rows_to_configs, select_config_rows
+from app.core.revision import revisions
+from app.core.serialization import FastJSONResponse, dumps
+from app.core.singleflight import flight_key, singleflight
+from app.core.snapshot import snapshots
+from app.core.type_registry import type_registry
+from app.core.writer import write_coalescer
+from app.models import fts
+from app.models.database import ReadSessionLocal, get_read_db
 from app.models.config import Config
 from app.models.type import Type
-from app.schemas.config import ConfigCreate, ConfigUpdate, Config as ConfigSchema, ConfigList, ConfigSearch
+from app.schemas.config import (
+    ConfigCreate, ConfigUpdate, Config as ConfigSchema, ConfigList, ConfigSearch,
+    ConfigMultiGet, ConfigNamespace, ConfigMultiGetResult, ConfigWatchResult
+)
 
 router = APIRouter()
 
+# upsert 使用的原生 SQL，RETURNING 的列按 ORM 类型解析
+_CONFIG_COLUMNS = 'config_id, type_id, "key", value, key_description, created_at, updated_at'
+_CONFIG_COLUMN_TYPES = {"created_at": DateTime, "updated_at": DateTime}
+
+_UPSERT_TYPE_SQL = text("""
+    INSERT INTO types (type_name, description, created_at)
+    VALUES (:type_name, :description, :now)
+    ON CONFLICT (type_name) DO NOTHING
+""").bindparams(bindparam("now", type_=DateTime))
+
+_UPSERT_CONFIG_SQL = text(f"""
+    INSERT INTO configs (type_id, "key", value, key_description, created_at, updated_at)
+    VALUES ((SELECT type_id FROM types WHERE type_name = :type_name), :key, :value, :key_description, :now, :now)
+    ON CONFLICT (type_id, "key") DO UPDATE SET
+        value = excluded.value,
+        key_description = COALESCE(excluded.key_description, configs.key_description),
+        updated_at = excluded.updated_at
+    RETURNING {_CONFIG_COLUMNS}
+""").bindparams(bindparam("now", type_=DateTime)).columns(**_CONFIG_COLUMN_TYPES)
+
+_UPDATE_DESCRIPTION_SQL = text(f"""
+    UPDATE configs SET
+        key_description = COALESCE(:key_description, key_description),
+        updated_at = :now
+    WHERE type_id = (SELECT type_id FROM types WHERE type_name = :type_name) AND "key" = :key
+    RETURNING {_CONFIG_COLUMNS}
+""").bindparams(bindparam("now", type_=DateTime)).columns(**_CONFIG_COLUMN_TYPES)
+
 @router.post("", response_model=ConfigSchema)
 async def create_config(
-    config_data: ConfigCreate,
-    db: AsyncSession = Depends(get_db)
+    config_data: ConfigCreate
 ):
     """
     创建新的配置项
-    """
-    # 查找或创建类型
-    result = await db.execute(select(Type).where(Type.type_name == config_data.type_name))
-    db_type = result.scalars().first()
     
-    if not db_type:
-        # 如果类型不存在，创建新类型
-        db_type = Type(type_name=config_data.type_name, description=f"自动创建的类型: {config_data.type_name}")
-        db.add(db_type)
-        await db.flush()  # 获取新创建类型的ID
-    
-    # 检查同一类型下是否已存在相同key的配置
-    result = await db.execute(
-        select(Config).where(
-            and_(
-                Config.type_id == db_type.type_id,
-                Config.key == config_data.key
+    写操作交给合并提交器，与并发的其他写请求在同一个事务中提交，
+    提交后由写任务失效缓存、发布事件，请求中途被取消也不会遗漏。
+    """
+    async def apply(db: AsyncSession) -> Tuple[ConfigSchema, int]:
+        # 查找或创建类型
+        type_id = await type_registry.lookup(db, config_data.type_name)
+        
+        if type_id is None:
+            # 如果类型不存在，创建新类型
+            db_type = Type(type_name=config_data.type_name, description=f"自动创建的类型: {config_data.type_name}")
+            db.add(db_type)
+            await db.flush()  # 获取新创建类型的ID
+            type_id = db_type.type_id
+        
+        # 检查同一类型下是否已存在相同key的配置
+        result = await db.execute(
+            select(Config).where(
+                and_(
+                    Config.type_id == type_id,
+                    Config.key == config_data.key
+                )
             )
         )
-    )
-    if result.scalars().first():
-        raise HTTPException(status_code=400, detail=f"类型 '{config_data.type_name}' 下已存在键 '{config_data.key}'")
-    
-    # 创建新配置
-    db_config = Config(
-        type_id=db_type.type_id,
-        key=config_data.key,
-        value=config_data.value,
-        key_description=config_data.key_description
-    )
-    db.add(db_config)
-    await db.commit()
-    await db.refresh(db_config)
-    
-    # 构建返回结果
-    result = ConfigSchema(
-        config_id=db_config.config_id,
-        type_id=db_config.type_id,
-        key=db_config.key,
-        value=db_config.value,
-        key_description=db_config.key_description,
-        created_at=db_config.created_at,
-        updated_at=db_config.updated_at,
-        type_name=db_type.type_name
-    )
-    
+        if result.scalars().first():
+            raise HTTPException(status_code=400, detail=f"类型 '{config_data.type_name}' 下已存在键 '{config_data.key}'")
+        
+        # 创建新配置
+        db_config = Config(
+            type_id=type_id,
+            key=config_data.key,
+            value=config_data.value,
+            key_description=config_data.key_description
+        )
+        db.add(db_config)
+        await db.flush()
+        await db.refresh(db_config)
+        change_revision = await changelog.record(db, "create", config_data.type_name, db_config.key, db_config.value)
+        
+        # 构建返回结果
+        return ConfigSchema(
+            config_id=db_config.config_id,
+            type_id=db_config.type_id,
+            key=db_config.key,
+            value=db_config.value,
+            key_description=db_config.key_description,
+            created_at=db_config.created_at,
+            updated_at=db_config.updated_at,
+            type_name=config_data.type_name
+        ), change_revision
+    
+    def after_commit(outcome):
+        result, change_revision = outcome
+        type_registry.add(result.type_name, result.type_id)
+        config_cache.invalidate(result.type_name, result.key)
+        event_hub.publish("create", result.type_name, result.key, result.value, change_revision)
+    
+    result, _ = await write_coalescer.submit(apply, after_commit)
     return result
 
 @router.get("", response_model=ConfigList)
 async def get_configs(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     type_name: Optional[str] = None,
     key: Optional[str] = None,
     value: Optional[str] = None,
     exact_match: bool = False,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 next_cursor，传入时忽略 skip"),
+    with_total: bool = Query(True, description="是否统计总数，逐页遍历时可关闭以省去 COUNT 查询"),
+    fields: Optional[str] = Query(None, description="只查询并返回这些字段，逗号分隔，如 key,value；为空时返回全部字段")
 ):
     """
     获取配置列表，支持按类型、键、值筛选
+    
+    同时到达的相同请求合并为一次查询，共享序列化后的响应。
     """
-    # 构建查询条件
-    conditions = []
+    columns = parse_fields(fields)
+    
+    # 按类型筛选时使用该类型的版本号，否则使用全局版本号
+    revision = revisions.current(type_name) if type_name else revisions.global_revision
+    etag = make_etag(revision)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    async def load() -> bytes:
+        # 构建查询条件，可走全文索引的子串条件放入 match_terms
+        conditions = []
+        match_terms = []
+        
+        async with ReadSessionLocal() as db:
+            if type_name:
+                # 按类型名称筛选
+                type_id = await type_registry.resolve(db, type_name)
+                if type_id is None:
+                    # 如果类型不存在，返回空列表
+                    return dumps({"configs": [], "total": 0, "next_cursor": None})
+                conditions.append(Config.type_id == type_id)
+            else:
+                type_id = None
+            
+            if key:
+                # 按键筛选
+                if exact_match:
+                    conditions.append(Config.key == key)
+                elif fts.can_match(key):
+                    match_terms.append(fts.phrase(key, "key"))
+                else:
+                    conditions.append(Config.key.like(f"%{key}%"))
+            
+            if value:
+                # 按值筛选
+                if exact_match:
+                    conditions.append(Config.value == value)
+                elif fts.can_match(value):
+                    match_terms.append(fts.phrase(value, "value"))
+                else:
+                    conditions.append(Config.value.like(f"%{value}%"))
+            
+            # 只按类型筛选或不筛选时，总数取自配置数统计，不执行 COUNT
+            counted = with_total and not key and not value
+            page = await fetch_config_page(
+                db, conditions, skip, limit, cursor, with_total and not counted, match_terms, fields=columns
+            )
+            if counted:
+                if type_id is not None:
+                    page["total"] = await aggregates.type_count(db, type_id)
+                else:
+                    page["total"] = (await aggregates.totals(db))[1]
+        return dumps(page)
+    
+    content = await singleflight.do(flight_key(request, revision), load)
+    return Response(content, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/bulk", response_model=ConfigNamespace)
+async def get_configs_bulk(
+    request: Request,
+    type_name: List[str] = Query(..., description="配置类型名称，可重复传入多个"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    批量获取一个或多个类型下的全部配置，单次查询返回 {类型: {键: 值}}
     
-    if type_name:
-        # 按类型名称筛选
-        result = await db.execute(select(Type).where(Type.type_name == type_name))
-        db_type = result.scalars().first()
-        if not db_type:
-            # 如果类型不存在，返回空列表
-            return {"configs": [], "total": 0}
-        conditions.append(Config.type_id == db_type.type_id)
+    启用快照时直接拼接各类型快照文件中预先序列化的字节，不查询配置表。
+    """
+    type_names = list(dict.fromkeys(type_name))
+    etag = make_etag(revisions.latest(type_names))
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    if snapshots.enabled:
+        parts = []
+        missing_types = []
+        for name in type_names:
+            type_id = await type_registry.resolve(db, name)
+            if type_id is None:
+                missing_types.append(name)
+                continue
+            snapshot = await snapshots.load(db, name, type_id)
+            parts.append(dumps(name) + b":" + snapshot.body())
+        content = b'{"configs":{' + b",".join(parts) + b'},"missing_types":' + dumps(missing_types) + b"}"
+        return Response(content, media_type="application/json", headers={"ETag": etag})
+    
+    # 以类型表左连接配置表，空类型也能与不存在的类型区分开
+    result = await db.execute(
+        select(Type.type_name, Config.key, Config.value)
+        .select_from(Type)
+        .outerjoin(Config, Config.type_id == Type.type_id)
+        .where(Type.type_name.in_(type_names))
+    )
     
-    if key:
-        # 按键筛选
-        if exact_match:
-            conditions.append(Config.key == key)
-        else:
-            conditions.append(Config.key.like(f"%{key}%"))
+    configs = {}
+    for name, config_key, config_value in result.all():
+        namespace = configs.setdefault(name, {})
+        if config_key is not None:
+            namespace[config_key] = config_value
     
-    if value:
-        # 按值筛选
-        if exact_match:
-            conditions.append(Config.value == value)
-        else:
-            conditions.append(Config.value.like(f"%{value}%"))
-    
-    # 构建查询
-    query = select(Config, Type.type_name).join(Type)
-    if conditions:
-        query = query.where(and_(*conditions))
-    
-    # 查询总数
-    count_query = select(func.count()).select_from(Config).join(Type)
-    if conditions:
-        count_query = count_query.where(and_(*conditions))
-    result = await db.execute(count_query)
-    total = result.scalar()
-    
-    # 查询配置列表
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # 构建返回结果
-    configs = []
-    for row in rows:
-        config, type_name = row
-        configs.append(
-            ConfigSchema(
-                config_id=config.config_id,
-                type_id=config.type_id,
-                key=config.key,
-                value=config.value,
-                key_description=config.key_description,
-                created_at=config.created_at,
-                updated_at=config.updated_at,
-                type_name=type_name
-            )
-        )
+    missing_types = [name for name in type_names if name not in configs]
+    return FastJSONResponse({"configs": configs, "missing_types": missing_types}, headers={"ETag": etag})
+
+@router.post("/bulk", response_model=ConfigMultiGetResult)
+async def multi_get_configs(
+    query_data: ConfigMultiGet,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    按 (类型, 键) 列表批量获取配置，单次查询返回 {类型: {键: 值}}
+    """
+    pairs = list(dict.fromkeys((item.type_name, item.key) for item in query_data.items))
+    if not pairs:
+        return {"configs": {}, "missing": []}
+    
+    # 所涉及的类型都有有效快照时按偏移索引直接切片，否则查询数据库
+    keys_by_type = {}
+    for name, config_key in pairs:
+        keys_by_type.setdefault(name, []).append(config_key)
+    loaded = {name: snapshots.get(name) for name in keys_by_type} if snapshots.enabled else {}
+    if loaded and all(snapshot is not None for snapshot in loaded.values()):
+        parts = []
+        missing = []
+        for name, config_keys in keys_by_type.items():
+            members = []
+            for config_key in config_keys:
+                value = loaded[name].value(config_key)
+                if value is None:
+                    missing.append({"type_name": name, "key": config_key})
+                else:
+                    members.append(dumps(config_key) + b":" + value)
+            if members:
+                parts.append(dumps(name) + b":{" + b",".join(members) + b"}")
+        content = b'{"configs":{' + b",".join(parts) + b'},"missing":' + dumps(missing) + b"}"
+        return Response(content, media_type="application/json")
+    
+    result = await db.execute(
+        select(Type.type_name, Config.key, Config.value)
+        .join(Type)
+        .where(tuple_(Type.type_name, Config.key).in_(pairs))
+    )
+    
+    configs = {}
+    for name, config_key, config_value in result.all():
+        configs.setdefault(name, {})[config_key] = config_value
+    
+    missing = [
+        {"type_name": name, "key": config_key}
+        for name, config_key in pairs
+        if config_key not in configs.get(name, {})
+    ]
+    return FastJSONResponse({"configs": configs, "missing": missing})
+
+@router.get("/watch", response_model=ConfigWatchResult)
+async def watch_configs(
+    type_name: List[str] = Query(..., description="要监听的配置类型名称，可重复传入多个"),
+    revision: Optional[int] = Query(None, description="客户端已知的版本号，为空时立即返回当前版本号"),
+    timeout: float = Query(30, ge=0, le=300, description="最长等待时间（秒）"),
+):
+    """
+    长轮询监听配置变化，直到所监听类型的版本号与 revision 不同或等待超时
+    """
+    type_names = list(dict.fromkeys(type_name))
+    changed = await revisions.wait(type_names, revision, timeout)
+    
+    return {
+        "changed": changed,
+        "revision": revisions.latest(type_names),
+        "revisions": {name: revisions.current(name) for name in type_names}
+    }
+
+@router.get("/events")
+async def stream_config_events(
+    type_name: Optional[List[str]] = Query(None, description="只接收这些类型的事件，为空时接收全部")
+):
+    """
+    以 Server-Sent Events 推送配置的新增、修改和删除事件
     
-    return {"configs": configs, "total": total}
+    队列溢出时推送 overflow 事件后断开，客户端应重新全量同步后再订阅。
+    """
+    subscriber = event_hub.subscribe(type_name)
+    
+    async def event_stream():
+        try:
+            while True:
+                if subscriber.overflowed:
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), settings.EVENT_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                data = json.dumps(event, ensure_ascii=False)
+                yield f"id: {event['revision']}\nevent: {event['op']}\ndata: {data}\n\n"
+        finally:
+            event_hub.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/{config_id}", response_model=ConfigSchema)
 async def get_config(
     config_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     获取指定配置项的详细信息
     """
-    result = await db.execute(
-        select(Config, Type.type_name)
-        .join(Type)
-        .where(Config.config_id == config_id)
-    )
+    # 配置ID不携带类型信息，使用全局版本号
+    etag = make_etag(revisions.global_revision)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    result = await db.execute(select_config_rows().where(Config.config_id == config_id))
     row = result.first()
     
     if not row:
         raise HTTPException(status_code=404, detail=f"配置ID {config_id} 不存在")
     
-    config, type_name = row
-    return ConfigSchema(
-        config_id=config.config_id,
-        type_id=config.type_id,
-        key=config.key,
-        value=config.value,
-        key_description=config.key_description,
-        created_at=config.created_at,
-        updated_at=config.updated_at,
-        type_name=type_name
-    )
+    config = (await rows_to_configs(db, CONFIG_FIELDS, [row]))[0]
+    return FastJSONResponse(config, headers={"ETag": etag})
 
 @router.put("/{config_id}", response_model=ConfigSchema)
 async def update_config(
     config_id: int,
-    config_data: ConfigUpdate,
-    db: AsyncSession = Depends(get_db)
+    config_data: ConfigUpdate
 ):
     """
     更新配置项
     """
-    result = await db.execute(
-        select(Config, Type.type_name)
-        .join(Type)
-        .where(Config.config_id == config_id)
-    )
-    row = result.first()
-    
-    if not row:
-        raise HTTPException(status_code=404, detail=f"配置ID {config_id} 不存在")
-    
-    config, type_name = row
-    
-    # 更新配置
-    if config_data.value is not None:
-        config.value = config_data.value
-    if config_data.key_description is not None:
-        config.key_description = config_data.key_description
-    
-    await db.commit()
-    await db.refresh(config)
-    
-    return ConfigSchema(
-        config_id=config.config_id,
-        type_id=config.type_id,
-        key=config.key,
-        value=config.value,
-        key_description=config.key_description,
-        created_at=config.created_at,
-        updated_at=config.updated_at,
-        type_name=type_name
-    )
+    async def apply(db: AsyncSession) -> Tuple[ConfigSchema, int]:
+        result = await db.execute(
+            select(Config, Type.type_name)
+            .join(Type)
+            .where(Config.config_id == config_id)
+        )
+        row = result.first()
+        
+        if not row:
+            raise HTTPException(status_code=404, detail=f"配置ID {config_id} 不存在")
+        
+        config, type_name = row
+        
+        # 更新配置
+        if config_data.value is not None:
+            config.value = config_data.value
+        if config_data.key_description is not None:
+            config.key_description = config_data.key_description
+        
+        await db.flush()
+        await db.refresh(config)
+        change_revision = await changelog.record(db, "update", type_name, config.key, config.value)
+        
+        return ConfigSchema(
+            config_id=config.config_id,
+            type_id=config.type_id,
+            key=config.key,
+            value=config.value,
+            key_description=config.key_description,
+            created_at=config.created_at,
+            updated_at=config.updated_at,
+            type_name=type_name
+        ), change_revision
+    
+    def after_commit(outcome):
+        result, change_revision = outcome
+        config_cache.invalidate(result.type_name, result.key)
+        event_hub.publish("update", result.type_name, result.key, result.value, change_revision)
+    
+    result, _ = await write_coalescer.submit(apply, after_commit)
+    return result
 
 @router.delete("/{config_id}", response_model=dict)
 async def delete_config(
-    config_id: int,
-    db: AsyncSession = Depends(get_db)
+    config_id: int
 ):
     """
     删除配置项（仅管理员）
     """
-    result = await db.execute(select(Config).where(Config.config_id == config_id))
-    config = result.scalars().first()
-    
-    if not config:
-        raise HTTPException(status_code=404, detail=f"配置ID {config_id} 不存在")
+    async def apply(db: AsyncSession) -> Tuple[str, str, int]:
+        result = await db.execute(
+            select(Config, Type.type_name)
+            .join(Type)
+            .where(Config.config_id == config_id)
+        )
+        row = result.first()
+        
+        if not row:
+            raise HTTPException(status_code=404, detail=f"配置ID {config_id} 不存在")
+        
+        config, type_name = row
+        await db.delete(config)
+        await db.flush()
+        change_revision = await changelog.record(db, "delete", type_name, config.key)
+        return type_name, config.key, change_revision
     
-    await db.delete(config)
-    await db.commit()
+    def after_commit(outcome):
+        type_name, key, change_revision = outcome
+        config_cache.invalidate(type_name, key)
+        event_hub.publish("delete", type_name, key, change_revision=change_revision)
     
+    await write_coalescer.submit(apply, after_commit)
     return {"message": f"配置ID {config_id} 已成功删除"}
 
 @router.post("/search", response_model=ConfigList)
@@ -234,27 +460,36 @@ async def search_configs(
     search_data: ConfigSearch,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 next_cursor，传入时忽略 skip"),
+    with_total: bool = Query(True, description="是否统计总数，逐页遍历时可关闭以省去 COUNT 查询"),
+    fields: Optional[str] = Query(None, description="只查询并返回这些字段，逗号分隔，如 key,value；为空时返回全部字段"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     高级搜索配置项
     """
-    # 构建查询条件
+    columns = parse_fields(fields)
+    
+    # 构建查询条件，可走全文索引的子串条件放入 match_terms
     conditions = []
+    match_terms = []
+    # 只有全文检索词按相关度排序，键、值筛选保持 config_id 顺序与游标分页
+    ranked = False
     
     if search_data.type_name:
         # 按类型名称筛选
-        result = await db.execute(select(Type).where(Type.type_name == search_data.type_name))
-        db_type = result.scalars().first()
-        if not db_type:
+        type_id = await type_registry.resolve(db, search_data.type_name)
+        if type_id is None:
             # 如果类型不存在，返回空列表
             return {"configs": [], "total": 0}
-        conditions.append(Config.type_id == db_type.type_id)
+        conditions.append(Config.type_id == type_id)
     
     if search_data.key:
         # 按键筛选
         if search_data.exact_match:
             conditions.append(Config.key == search_data.key)
+        elif fts.can_match(search_data.key):
+            match_terms.append(fts.phrase(search_data.key, "key"))
         else:
             conditions.append(Config.key.like(f"%{search_data.key}%"))
     
@@ -262,187 +497,242 @@ async def search_configs(
         # 按值筛选
         if search_data.exact_match:
             conditions.append(Config.value == search_data.value)
+        elif fts.can_match(search_data.value):
+            match_terms.append(fts.phrase(search_data.value, "value"))
         else:
             conditions.append(Config.value.like(f"%{search_data.value}%"))
     
-    # 构建查询
-    query = select(Config, Type.type_name).join(Type)
-    if conditions:
-        query = query.where(and_(*conditions))
-    
-    # 查询总数
-    count_query = select(func.count()).select_from(Config).join(Type)
-    if conditions:
-        count_query = count_query.where(and_(*conditions))
-    result = await db.execute(count_query)
-    total = result.scalar()
-    
-    # 查询配置列表
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # 构建返回结果
-    configs = []
-    for row in rows:
-        config, type_name = row
-        configs.append(
-            ConfigSchema(
-                config_id=config.config_id,
-                type_id=config.type_id,
-                key=config.key,
-                value=config.value,
-                key_description=config.key_description,
-                created_at=config.created_at,
-                updated_at=config.updated_at,
-                type_name=type_name
-            )
+    if search_data.keyword:
+        # 同时匹配键、值和描述
+        if fts.can_match(search_data.keyword):
+            match_terms.append(fts.phrase(search_data.keyword))
+            ranked = True
+        else:
+            pattern = f"%{search_data.keyword}%"
+            conditions.append(or_(
+                Config.key.like(pattern),
+                Config.value.like(pattern),
+                Config.key_description.like(pattern)
+            ))
+    
+    page = await fetch_config_page(
+        db, conditions, skip, limit, cursor, with_total, match_terms, ranked=ranked, fields=columns
+    )
+    return FastJSONResponse(page)
+
+async def _load_config(type_name: str, key: str) -> dict:
+    """从数据库读取单个配置的完整字段并写入缓存"""
+    cache_version = config_cache.version
+    
+    async with ReadSessionLocal() as db:
+        # 类型ID取自注册表，直接按 (type_id, key) 查询配置
+        type_id = await type_registry.resolve(db, type_name)
+        if type_id is None:
+            raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 不存在")
+        
+        result = await db.execute(
+            select_config_rows().where(Config.type_id == type_id, Config.key == key)
         )
+        row = result.first()
     
-    return {"configs": configs, "total": total}
+    if not row:
+        raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 下不存在键 '{key}'")
+    
+    config = dict(zip(CONFIG_FIELDS, row))
+    config["type_name"] = type_name
+    config_cache.set(type_name, key, config, cache_version)
+    return config
 
 @router.get("/type/{type_name}/key/{key}", response_model=ConfigSchema)
 async def get_config_by_type_and_key(
     type_name: str,
     key: str,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    fields: Optional[str] = Query(None, description="只查询并返回这些字段，逗号分隔，如 key,value；为空时返回全部字段")
 ):
     """
     通过类型名称和键获取配置
-    """
-    # 查找类型
-    result = await db.execute(select(Type).where(Type.type_name == type_name))
-    db_type = result.scalars().first()
-    
-    if not db_type:
-        raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 不存在")
     
-    # 查找配置
-    result = await db.execute(
-        select(Config)
-        .where(
-            and_(
-                Config.type_id == db_type.type_id,
-                Config.key == key
-            )
+    缓存未命中时，同时到达的相同请求只查询一次数据库。
+    """
+    columns = parse_fields(fields)
+    etag = make_etag(revisions.current(type_name))
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    config = config_cache.get(type_name, key)
+    if config is None:
+        config = await singleflight.do(
+            ("config", type_name, key, revisions.current(type_name)),
+            lambda: _load_config(type_name, key)
         )
-    )
-    config = result.scalars().first()
-    
-    if not config:
-        raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 下不存在键 '{key}'")
     
-    return ConfigSchema(
-        config_id=config.config_id,
-        type_id=config.type_id,
-        key=config.key,
-        value=config.value,
-        key_description=config.key_description,
-        created_at=config.created_at,
-        updated_at=config.updated_at,
-        type_name=type_name
-    )
+    # 缓存中保存完整字段，按需裁剪返回
+    if columns is not CONFIG_FIELDS:
+        config = {name: config[name] for name in columns}
+    return FastJSONResponse(config, headers={"ETag": etag})
 
 @router.delete("/type/{type_name}/key/{key}", response_model=dict)
 async def delete_config_by_type_and_key(
     type_name: str,
-    key: str,
-    db: AsyncSession = Depends(get_db)
+    key: str
 ):
     """
     通过类型名称和键删除配置（仅管理员）
     """
-    # 查找类型
-    result = await db.execute(select(Type).where(Type.type_name == type_name))
-    db_type = result.scalars().first()
-    
-    if not db_type:
-        raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 不存在")
-    
-    # 查找配置
-    result = await db.execute(
-        select(Config)
-        .where(
-            and_(
-                Config.type_id == db_type.type_id,
-                Config.key == key
+    async def apply(db: AsyncSession):
+        # 查找类型
+        type_id = await type_registry.lookup(db, type_name)
+        
+        if type_id is None:
+            raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 不存在")
+        
+        # 查找配置
+        result = await db.execute(
+            select(Config)
+            .where(
+                and_(
+                    Config.type_id == type_id,
+                    Config.key == key
+                )
             )
         )
-    )
-    config = result.scalars().first()
+        config = result.scalars().first()
+        
+        if not config:
+            raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 下不存在键 '{key}'")
+        
+        await db.delete(config)
+        await db.flush()
+        return await changelog.record(db, "delete", type_name, key)
     
-    if not config:
-        raise HTTPException(status_code=404, detail=f"类型 '{type_name}' 下不存在键 '{key}'")
+    def after_commit(change_revision):
+        config_cache.invalidate(type_name, key)
+        event_hub.publish("delete", type_name, key, change_revision=change_revision)
     
+    await write_coalescer.submit(apply, after_commit)
+    return {"message": f"配置项 {type_name}.{key} 已成功删除"}
+
 # 修改删除配置项的端点s
 @router.put("/{type_name}/{key}", response_model=ConfigSchema)
 async def update_config_by_type_and_key(
         type_name: str,
         key: str,
-        config_data: ConfigUpdate,
-        db: AsyncSession = Depends(get_db)
+        config_data: ConfigUpdate
     ):
     """
-    通过类型名称和键更新配置
-    """
-    # 查询配置项
-    result = await db.execute(
-        select(Config).join(Type).where(
-            Type.type_name == type_name,
-            Config.key == key
-        )
-    )
-    config = result.scalar_one_or_none()
-    
-    if not config:
-        raise HTTPException(status_code=404, detail=f"找不到配置项: {type_name}.{key}")
-    
-    # 更新配置
-    if config_data.value is not None:
-        config.value = config_data.value
-    if config_data.key_description is not None:
-        config.key_description = config_data.key_description
-    
-    await db.commit()
-    await db.refresh(config)
+    通过类型名称和键创建或更新配置
     
+    类型不存在时自动创建；配置不存在且提供了 value 时新建，存在时更新。
+    整个过程用 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 完成，与并发写请求合并提交。
+    """
+    now = datetime.utcnow()
+    params = {
+        "type_name": type_name,
+        "key": key,
+        "value": config_data.value,
+        "key_description": config_data.key_description,
+        "now": now
+    }
+    
+    async def apply(db: AsyncSession):
+        try:
+            if config_data.value is None:
+                # 未提供 value 时只能更新已有配置的描述
+                result = await db.execute(_UPDATE_DESCRIPTION_SQL, params)
+            else:
+                await db.execute(_UPSERT_TYPE_SQL, {
+                    "type_name": type_name,
+                    "description": f"自动创建的类型: {type_name}",
+                    "now": now
+                })
+                result = await db.execute(_UPSERT_CONFIG_SQL, params)
+        except IntegrityError as e:
+            raise HTTPException(status_code=400, detail=f"写入配置项失败: {e.orig}")
+        row = result.first()
+        
+        if not row:
+            raise HTTPException(status_code=404, detail=f"找不到配置项: {type_name}.{key}")
+        
+        # 插入时 created_at 取本次请求的时间，据此区分新建与更新
+        op = "create" if row.created_at == now else "update"
+        change_revision = await changelog.record(db, op, type_name, key, row.value)
+        return row, op, change_revision
+    
+    def after_commit(outcome):
+        row, op, change_revision = outcome
+        type_registry.add(type_name, row.type_id)
+        config_cache.invalidate(type_name, key)
+        event_hub.publish(op, type_name, key, row.value, change_revision)
+    
+    row, _, _ = await write_coalescer.submit(apply, after_commit)
     return ConfigSchema(
-        config_id=config.config_id,
-        type_id=config.type_id,
-        key=config.key,
-        value=config.value,
-        key_description=config.key_description,
-        created_at=config.created_at,
-        updated_at=config.updated_at,
+        config_id=row.config_id,
+        type_id=row.type_id,
+        key=row.key,
+        value=row.value,
+        key_description=row.key_description,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
         type_name=type_name
     )
 
 @router.delete("/{type_name}/{key}", response_model=dict)
 async def delete_config(
         type_name: str,
-        key: str,
-        db: AsyncSession = Depends(get_db)
+        key: str
     ):
         """
         删除配置项
         """
         
-        # 查询配置项
-        result = await db.execute(
-            select(Config).join(Type).where(
-                Type.type_name == type_name,
-                Config.key == key
+        async def apply(db: AsyncSession):
+            # 查询配置项
+            type_id = await type_registry.lookup(db, type_name)
+            result = await db.execute(
+                select(Config).where(
+                    Config.type_id == type_id,
+                    Config.key == key
+                )
             )
-        )
-        config = result.scalar_one_or_none()
+            config = result.scalar_one_or_none()
+            
+            if not config:
+                raise HTTPException(status_code=404, detail=f"找不到配置项: {type_name}.{key}")
+            
+            # 删除配置项
+            await db.delete(config)
+            await db.flush()
+            return await changelog.record(db, "delete", type_name, key)
         
-        if not config:
-            raise HTTPException(status_code=404, detail=f"找不到配置项: {type_name}.{key}")
+        def after_commit(change_revision):
+            config_cache.invalidate(type_name, key)
+            event_hub.publish("delete", type_name, key, change_revision=change_revision)
         
-        # 删除配置项
-        await db.delete(config)
-        await db.commit()
+        await write_coalescer.submit(apply, after_commit)
         
         # return config1212
         
-        return {"message": "配置项已删除"}
\ No newline at end of file
+        return {"message": "配置项已删除"}
+
+@router.get("/cache/stats", response_model=dict)
+async def get_cache_stats():
+    """
+    获取配置项读缓存的命中、未命中与淘汰统计
+    """
+    return config_cache.stats()
+
+@router.get("/snapshot/stats", response_model=dict)
+async def get_snapshot_stats():
+    """
+    获取配置快照的数量、大小、命中与重建统计
+    """
+    return snapshots.stats()
+
+@router.get("/singleflight/stats", response_model=dict)
+async def get_singleflight_stats():
+    """
+    获取相同读请求合并的执行与共享次数统计
+    """
+    return singleflight.stats()
\ No newline at end of file
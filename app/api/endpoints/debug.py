@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.core.profiler import profiler
+
+router = APIRouter()
+
+@router.get("/profiles", response_model=dict)
+async def get_profiles(
+    limit: Optional[int] = Query(None, ge=1, description="最多返回的问题请求数，为空时返回全部保留的记录")
+):
+    """
+    获取最近的问题请求（SQL 条数或耗时超出阈值、包含慢查询），最新的在前
+    
+    需要 PROFILING_ENABLED=true，未开启时 offenders 始终为空。
+    """
+    return {**profiler.stats(), "offenders": profiler.recent(limit)}
+
+@router.delete("/profiles", response_model=dict)
+async def clear_profiles():
+    """
+    清空已记录的问题请求
+    """
+    profiler.clear()
+    return {"message": "已清空问题请求记录"}
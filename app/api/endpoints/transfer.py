@@ -0,0 +1,339 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text, bindparam, DateTime
+from sqlalchemy.exc import SQLAlchemyError
+from app.core import changelog
+from app.core.cache import config_cache
+from app.core.config import settings
+from app.core.events import event_hub
+from app.core.type_registry import type_registry
+from app.core.writer import write_coalescer
+from app.models.config import Config
+from app.models.database import ReadSessionLocal
+from app.models.type import Type
+from app.schemas.config import ConfigImportItem, ConfigImportResult
+
+# 配置导入导出路由，挂载在 /configs 下，需注册在 configs 路由之前
+router = APIRouter()
+
+_INSERT_TYPE_SQL = text("""
+    INSERT INTO types (type_name, description, created_at)
+    VALUES (:type_name, :description, :now)
+    ON CONFLICT (type_name) DO NOTHING
+""").bindparams(bindparam("now", type_=DateTime))
+
+_IMPORT_CONFIG_SQL = text("""
+    INSERT INTO configs (type_id, "key", value, key_description, created_at, updated_at)
+    VALUES (:type_id, :key, :value, :key_description, :now, :now)
+    ON CONFLICT (type_id, "key") DO UPDATE SET
+        value = excluded.value,
+        key_description = COALESCE(excluded.key_description, configs.key_description),
+        updated_at = excluded.updated_at
+""").bindparams(bindparam("now", type_=DateTime))
+
+# 导出的列，与导入格式一致并附带时间戳
+_EXPORT_COLUMNS = ["type_name", "key", "value", "key_description", "created_at", "updated_at"]
+
+# 导出时每次从游标读取的行数
+_EXPORT_BATCH_SIZE = 1000
+
+# 按 Content-Type 识别导入格式
+_FORMAT_BY_CONTENT_TYPE = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-yaml": "yaml",
+    "application/yaml": "yaml",
+    "text/yaml": "yaml",
+}
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _parse_payload(body: bytes, fmt: str) -> List[Any]:
+    """
+    解析导入内容，返回原始行列表
+    
+    NDJSON 中无法解析的行以异常对象占位，在逐行校验时报告。
+    """
+    if fmt == "ndjson":
+        rows = []
+        for line in body.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                rows.append(e)
+        return rows
+    
+    if fmt == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            raise HTTPException(status_code=415, detail="导入 YAML 需要安装 PyYAML")
+        try:
+            data = yaml.safe_load(body)
+        except yaml.YAMLError as e:
+            raise HTTPException(status_code=400, detail=f"YAML 解析失败: {e}")
+    else:
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"JSON 解析失败: {e}")
+    
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=400, detail="导入内容必须是数组或包含 items 数组的对象")
+    return data
+
+def _validate_row(raw: Any) -> ConfigImportItem:
+    """校验单行数据，非字符串的值按 JSON 序列化后保存"""
+    if isinstance(raw, Exception):
+        raise ValueError(f"解析失败: {raw}")
+    if not isinstance(raw, dict):
+        raise ValueError("每行必须是包含 type_name、key、value 的对象")
+    
+    value = raw.get("value")
+    if value is not None and not isinstance(value, str):
+        raw = {**raw, "value": json.dumps(value, ensure_ascii=False)}
+    try:
+        return ConfigImportItem(**raw)
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+async def _ensure_types(db: AsyncSession, type_names: List[str], now: datetime) -> Dict[str, int]:
+    """一次性补建缺失的类型，返回 类型名称 -> type_id"""
+    await db.execute(_INSERT_TYPE_SQL, [
+        {"type_name": name, "description": f"自动创建的类型: {name}", "now": now}
+        for name in type_names
+    ])
+    type_ids = {}
+    for chunk in _chunks(type_names, settings.IMPORT_CHUNK_SIZE):
+        result = await db.execute(select(Type.type_name, Type.type_id).where(Type.type_name.in_(chunk)))
+        type_ids.update(result.all())
+    return type_ids
+
+def _import_params(rows: List[tuple], type_ids: Dict[str, int], now: datetime) -> List[dict]:
+    return [
+        {
+            "type_id": type_ids[item.type_name],
+            "key": item.key,
+            "value": item.value,
+            "key_description": item.key_description,
+            "now": now
+        }
+        for _, item in rows
+    ]
+
+def _import_changes(rows: List[tuple]) -> List[dict]:
+    return [
+        {"op": "upsert", "type_name": item.type_name, "key": item.key, "value": item.value}
+        for _, item in rows
+    ]
+
+def _publish_import(type_names: List[str], change_revisions: List[int]):
+    """
+    每个类型发布一条 import 事件，不逐行发布
+    
+    逐行发布时大批量导入会写满订阅者队列，使所有订阅者断开。事件的 change_revision 取这批
+    配置之前的变更版本号，订阅者以它作为 since 调用 GET /api/changes 即可取得导入的配置。
+    """
+    since = min(change_revisions) - 1
+    for type_name in dict.fromkeys(type_names):
+        event_hub.publish("import", type_name, change_revision=since)
+
+@router.post("/import", response_model=ConfigImportResult)
+async def import_configs(
+    request: Request,
+    mode: Literal["atomic", "best_effort"] = Query("atomic", description="atomic：全部成功或全部回滚；best_effort：逐批提交，跳过失败行"),
+    fmt: Optional[Literal["json", "ndjson", "yaml"]] = Query(None, alias="format", description="导入格式，为空时按 Content-Type 识别")
+):
+    """
+    批量导入配置，按 (类型, 键) 创建或更新
+    
+    支持 JSON 数组、NDJSON 与 YAML，每行包含 type_name、key、value、key_description。
+    缺失的类型一次性补建，配置按批次 executemany 写入。写入经由合并提交的写任务执行：
+    atomic 模式作为一个写操作在一个事务中完成，期间其他写请求在写任务的队列中等待；
+    best_effort 模式每批单独提交，整批失败时在同一写操作中逐行重试。
+    """
+    if fmt is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        fmt = _FORMAT_BY_CONTENT_TYPE.get(content_type, "json")
+    raw_rows = _parse_payload(await request.body(), fmt)
+    
+    # 逐行校验
+    results = []
+    valid_rows = []
+    for index, raw in enumerate(raw_rows):
+        try:
+            item = _validate_row(raw)
+        except ValueError as e:
+            results.append({"index": index, "status": "error", "error": str(e)})
+            continue
+        results.append({"index": index, "type_name": item.type_name, "key": item.key, "status": "ok"})
+        valid_rows.append((index, item))
+    
+    def report(status_code: int = 200):
+        failed = sum(1 for row in results if row["status"] == "error")
+        succeeded = sum(1 for row in results if row["status"] == "ok")
+        content = {
+            "mode": mode,
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": failed,
+            "results": results
+        }
+        return content if status_code == 200 else JSONResponse(status_code=status_code, content=content)
+    
+    def mark(rows: List[tuple], status: str, error: Optional[str] = None):
+        for index, _ in rows:
+            results[index]["status"] = status
+            results[index]["error"] = error
+    
+    if mode == "atomic" and len(valid_rows) < len(results):
+        mark(valid_rows, "skipped")
+        return report(400)
+    if not valid_rows:
+        return report()
+    
+    now = datetime.utcnow()
+    type_names = list(dict.fromkeys(item.type_name for _, item in valid_rows))
+    
+    def register_types(type_ids: Dict[str, int]):
+        for type_name, type_id in type_ids.items():
+            type_registry.add(type_name, type_id)
+    
+    def after_import(rows: List[tuple], change_revisions: List[int]):
+        if not rows:
+            return
+        imported_types = [item.type_name for _, item in rows]
+        for type_name in dict.fromkeys(imported_types):
+            config_cache.invalidate_type(type_name)
+        _publish_import(imported_types, change_revisions)
+    
+    if mode == "atomic":
+        async def apply_all(db: AsyncSession):
+            type_ids = await _ensure_types(db, type_names, now)
+            change_revisions = []
+            for chunk in _chunks(valid_rows, settings.IMPORT_CHUNK_SIZE):
+                await db.execute(_IMPORT_CONFIG_SQL, _import_params(chunk, type_ids, now))
+                change_revisions.extend(await changelog.record_many(db, _import_changes(chunk)))
+            return type_ids, change_revisions
+        
+        def after_commit(outcome):
+            type_ids, change_revisions = outcome
+            register_types(type_ids)
+            after_import(valid_rows, change_revisions)
+        
+        try:
+            await write_coalescer.submit(apply_all, after_commit)
+        except SQLAlchemyError as e:
+            mark(valid_rows, "error", f"导入失败，已全部回滚: {e}")
+            return report(500)
+        return report()
+    
+    async def apply_types(db: AsyncSession):
+        return await _ensure_types(db, type_names, now)
+    
+    try:
+        type_ids = await write_coalescer.submit(apply_types, register_types)
+    except SQLAlchemyError as e:
+        mark(valid_rows, "error", f"创建类型失败: {e}")
+        return report(500)
+    
+    def apply_chunk(chunk: List[tuple]):
+        async def apply(db: AsyncSession):
+            try:
+                async with db.begin_nested():
+                    await db.execute(_IMPORT_CONFIG_SQL, _import_params(chunk, type_ids, now))
+                    return chunk, await changelog.record_many(db, _import_changes(chunk)), []
+            except SQLAlchemyError:
+                pass
+            
+            # 整批失败时逐行重试，定位失败的行
+            committed, change_revisions, failed = [], [], []
+            for row in chunk:
+                try:
+                    async with db.begin_nested():
+                        await db.execute(_IMPORT_CONFIG_SQL, _import_params([row], type_ids, now))
+                        change_revisions.extend(await changelog.record_many(db, _import_changes([row])))
+                    committed.append(row)
+                except SQLAlchemyError as e:
+                    failed.append((row, str(e.orig if hasattr(e, "orig") else e)))
+            return committed, change_revisions, failed
+        return apply
+    
+    # 每批作为一个写操作提交，批次之间其他写请求可以插入，不会长时间占用写锁
+    for chunk in _chunks(valid_rows, settings.IMPORT_CHUNK_SIZE):
+        try:
+            _, _, failed = await write_coalescer.submit(
+                apply_chunk(chunk), lambda outcome: after_import(outcome[0], outcome[1])
+            )
+        except SQLAlchemyError as e:
+            mark(chunk, "error", str(e.orig if hasattr(e, "orig") else e))
+            continue
+        for row, error in failed:
+            mark([row], "error", error)
+    
+    return report()
+
+@router.get("/export")
+async def export_configs(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="导出格式"),
+    type_name: Optional[List[str]] = Query(None, description="只导出这些类型，为空时导出全部")
+):
+    """
+    流式导出配置
+    
+    通过服务端游标分批读取 configs 与 types 的连接结果，逐行写出 NDJSON 或 CSV，
+    内存占用与数据量无关。NDJSON 导出结果可直接用于导入接口。
+    """
+    query = (
+        select(Type.type_name, Config.key, Config.value, Config.key_description, Config.created_at, Config.updated_at)
+        .join(Type)
+        .order_by(Config.config_id)
+        .execution_options(yield_per=_EXPORT_BATCH_SIZE)
+    )
+    if type_name:
+        query = query.where(Type.type_name.in_(type_name))
+    
+    def encode_ndjson(rows) -> str:
+        lines = []
+        for row in rows:
+            record = dict(zip(_EXPORT_COLUMNS, row))
+            record["created_at"] = record["created_at"].isoformat() if record["created_at"] else None
+            record["updated_at"] = record["updated_at"].isoformat() if record["updated_at"] else None
+            lines.append(json.dumps(record, ensure_ascii=False))
+        return "\n".join(lines) + "\n"
+    
+    def encode_csv(rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    
+    encode = encode_ndjson if fmt == "ndjson" else encode_csv
+    
+    async def generate():
+        # 使用独立的只读会话，响应流结束后才释放连接
+        async with ReadSessionLocal() as session:
+            if fmt == "csv":
+                yield encode_csv([_EXPORT_COLUMNS])
+            result = await session.stream(query)
+            async for rows in result.partitions(_EXPORT_BATCH_SIZE):
+                yield encode(rows)
+    
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "text/csv"
+    return StreamingResponse(
+        generate(),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="configs.{fmt}"'}
+    )
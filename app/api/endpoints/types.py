@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
-from app.models.database import get_db
+from app.core import changelog
+from app.core.aggregates import aggregates
+from app.core.cache import config_cache
+from app.core.etag import make_etag, not_modified
+from app.core.events import event_hub
+from app.core.revision import revisions
+from app.core.serialization import dumps
+from app.core.singleflight import flight_key, singleflight
+from app.core.snapshot import snapshots
+from app.core.type_registry import type_registry
+from app.models.database import ReadSessionLocal, get_db, get_read_db
 from app.models.type import Type
-from app.models.config import Config
+from app.models.counts import type_config_counts
 from app.schemas.type import TypeCreate, TypeUpdate, Type as TypeSchema, TypeList
 
 router = APIRouter()
@@ -12,29 +22,45 @@ router = APIRouter()
 # 删除重复的路由，只保留一个获取所有类型的路由
 @router.get("", response_model=TypeList)
 async def get_types(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    search: Optional[str] = None
 ):
     """
     获取所有配置类型
-    """
-    # 构建查询条件
-    query = select(Type)
-    if search:
-        query = query.where(Type.type_name.contains(search) | Type.description.contains(search))
-    
-    # 查询总数
-    count_query = select(func.count()).select_from(query.subquery())
-    result = await db.execute(count_query)
-    total = result.scalar()
-    
-    # 查询类型列表
-    result = await db.execute(query.offset(skip).limit(limit))
-    types = result.scalars().all()
     
-    return {"types": types, "total": total}
+    同时到达的相同请求合并为一次查询，共享序列化后的响应。
+    """
+    revision = revisions.global_revision
+    etag = make_etag(revision)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    
+    async def load() -> bytes:
+        # 构建查询条件
+        query = select(Type)
+        if search:
+            query = query.where(Type.type_name.contains(search) | Type.description.contains(search))
+        
+        async with ReadSessionLocal() as db:
+            # 查询总数，不带搜索条件时取自配置数统计
+            if search:
+                count_query = select(func.count()).select_from(query.subquery())
+                result = await db.execute(count_query)
+                total = result.scalar()
+            else:
+                total = (await aggregates.totals(db))[0]
+            
+            # 查询类型列表
+            result = await db.execute(query.offset(skip).limit(limit))
+            types = result.scalars().all()
+        
+        return dumps(TypeList.model_validate({"types": types, "total": total}).model_dump())
+    
+    content = await singleflight.do(flight_key(request, revision), load)
+    return Response(content, media_type="application/json", headers={"ETag": etag})
 
 @router.post("", response_model=TypeSchema)
 async def create_type(
@@ -46,21 +72,23 @@ async def create_type(
     """
     
     # 检查类型名是否已存在
-    result = await db.execute(select(Type).where(Type.type_name == type_data.type_name))
-    if result.scalars().first():
+    if await type_registry.lookup(db, type_data.type_name) is not None:
         raise HTTPException(status_code=400, detail="类型名已存在")
     
     # 创建新类型
     db_type = Type(**type_data.dict())
     db.add(db_type)
+    change_revision = await changelog.record(db, "type_create", db_type.type_name, value=db_type.description)
     await db.commit()
     await db.refresh(db_type)
+    type_registry.add(db_type.type_name, db_type.type_id)
+    event_hub.publish("type_create", db_type.type_name, change_revision=change_revision)
     return db_type
 
 @router.get("/{type_name}", response_model=TypeSchema)
 async def get_type(
     type_name: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     获取指定类型的详细信息
@@ -94,8 +122,10 @@ async def update_type(
     if type_data.description is not None:
         db_type.description = type_data.description
     
+    change_revision = await changelog.record(db, "type_update", db_type.type_name, value=db_type.description)
     await db.commit()
     await db.refresh(db_type)
+    event_hub.publish("type_update", db_type.type_name, change_revision=change_revision)
     return db_type
 
 @router.delete("/{type_name}", response_model=TypeSchema)
@@ -116,17 +146,22 @@ async def delete_type(
     if not type_obj:
         raise HTTPException(status_code=404, detail=f"找不到类型: {type_name}")
     
-    # 检查是否有关联的配置项
-    configs_result = await db.execute(
-        select(Config).where(Config.type_id == type_obj.type_id)
+    # 检查是否有关联的配置项，配置数取自统计表，与删除在同一个事务中读取
+    result = await db.execute(
+        select(type_config_counts.c.config_count).where(type_config_counts.c.type_id == type_obj.type_id)
     )
-    configs = configs_result.scalars().all()
+    config_count = result.scalar() or 0
     
-    if configs:
-        raise HTTPException(status_code=400, detail=f"类型 {type_name} 下有 {len(configs)} 个配置项，请先删除这些配置项")
+    if config_count:
+        raise HTTPException(status_code=400, detail=f"类型 {type_name} 下有 {config_count} 个配置项，请先删除这些配置项")
     
     # 删除类型
     await db.delete(type_obj)
+    change_revision = await changelog.record(db, "type_delete", type_name)
     await db.commit()
+    type_registry.remove(type_name)
+    snapshots.discard(type_name)
+    config_cache.invalidate_type(type_name)
+    event_hub.publish("type_delete", type_name, change_revision=change_revision)
     
     return type_obj
\ No newline at end of file
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request, Depends, Query
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import Optional
+from sqlalchemy import select, or_
+from typing import Optional, Tuple
 
-from app.models.database import get_db
+from app.core.aggregates import aggregates
+from app.core.pagination import decode_cursor, encode_cursor, fetch_config_page
+from app.core.serialization import FastJSONResponse, rows_to_dicts
+from app.core.type_registry import type_registry
+from app.models import fts
+from app.models.database import get_read_db
 from app.models.type import Type
 from app.models.config import Config
 
@@ -17,15 +22,10 @@ page_router = APIRouter()
 templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 @page_router.get("/", response_class=HTMLResponse)
-async def index_page(request: Request, db: AsyncSession = Depends(get_db)):
+async def index_page(request: Request, db: AsyncSession = Depends(get_read_db)):
     """首页"""
-    # 查询类型数量
-    result = await db.execute(select(func.count()).select_from(Type))
-    type_count = result.scalar()
-    
-    # 查询配置项数量
-    result = await db.execute(select(func.count()).select_from(Config))
-    config_count = result.scalar()
+    # 类型数量与配置项数量取自配置数统计
+    type_count, config_count = await aggregates.totals(db)
     return templates.TemplateResponse(
         "index.html", 
         {
@@ -37,76 +37,128 @@ async def index_page(request: Request, db: AsyncSession = Depends(get_db)):
 
 
 
+# 每页渲染的行数，首页由服务端渲染，后续页面由页面脚本按游标加载
+PAGE_SIZE = 50
+
+_TYPE_FIELDS = ("type_id", "type_name", "description", "created_at")
+
+async def _fetch_type_page(db: AsyncSession, search: Optional[str], cursor: Optional[str], limit: int) -> dict:
+    """按 type_id 顺序以键集分页查询一页类型"""
+    query = select(Type.type_id, Type.type_name, Type.description, Type.created_at)
+    if search:
+        query = query.where(Type.type_name.contains(search) | Type.description.contains(search))
+    if cursor:
+        query = query.where(Type.type_id > decode_cursor(cursor))
+    result = await db.execute(query.order_by(Type.type_id).limit(limit + 1))
+    rows = result.all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].type_id)
+    return {"types": rows_to_dicts(_TYPE_FIELDS, rows), "next_cursor": next_cursor}
+
+async def _config_filters(
+    db: AsyncSession,
+    type_name: Optional[str],
+    key: Optional[str],
+    value: Optional[str],
+    search: Optional[str]
+) -> Tuple[list, list]:
+    """构建配置项页面的筛选条件，可走全文索引的子串条件放入 match_terms"""
+    conditions = []
+    match_terms = []
+    if type_name:
+        # 类型名称完整匹配时直接按 type_id 过滤，否则按子串匹配
+        type_id = await type_registry.resolve(db, type_name)
+        if type_id is not None:
+            conditions.append(Config.type_id == type_id)
+        else:
+            conditions.append(Config.type_id.in_(select(Type.type_id).where(Type.type_name.contains(type_name))))
+    if key:
+        if fts.can_match(key):
+            match_terms.append(fts.phrase(key, "key"))
+        else:
+            conditions.append(Config.key.contains(key))
+    if value:
+        if fts.can_match(value):
+            match_terms.append(fts.phrase(value, "value"))
+        else:
+            conditions.append(Config.value.contains(value))
+    if search:
+        # 搜索框同时匹配键、值和描述
+        if fts.can_match(search):
+            match_terms.append(fts.phrase(search))
+        else:
+            conditions.append(or_(
+                Config.key.contains(search),
+                Config.value.contains(search),
+                Config.key_description.contains(search)
+            ))
+    return conditions, match_terms
+
 @page_router.get("/types", response_class=HTMLResponse)
 async def types_page(
     request: Request, 
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """配置类型页面"""
-    query = select(Type)
-    if search:
-        query = query.where(Type.type_name.contains(search) | Type.description.contains(search))
-    
-    result = await db.execute(query)
-    types = result.scalars().all()
+    """配置类型页面，只渲染第一页"""
+    page = await _fetch_type_page(db, search, None, PAGE_SIZE)
     
     return templates.TemplateResponse(
         "types.html", 
         {
             "request": request, 
-            "types": types,
+            "types": page["types"],
+            "next_cursor": page["next_cursor"],
             "search": search
         }
     )
 
+@page_router.get("/types/data")
+async def types_page_data(
+    search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 next_cursor"),
+    limit: int = Query(PAGE_SIZE, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """配置类型页面的后续分页数据"""
+    return FastJSONResponse(await _fetch_type_page(db, search, cursor, limit))
+
 @page_router.get("/configs", response_class=HTMLResponse)
 async def configs_page(
     request: Request,
     type_name: Optional[str] = None,
     key: Optional[str] = None,
     value: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """配置项页面"""
-    # 构建查询
-    query = select(Config, Type).join(Type)
-    
-    # 添加筛选条件
-    if type_name:
-        query = query.where(Type.type_name.contains(type_name))
-    if key:
-        query = query.where(Config.key.contains(key))
-    if value:
-        query = query.where(Config.value.contains(value))
-    
-    # 执行查询
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # 处理查询结果，构建包含类型信息的配置数据
-    configs = [{
-        "config_id": row[0].config_id,
-        "key": row[0].key,
-        "value": row[0].value,
-        "key_description": row[0].key_description,
-        "created_at": row[0].created_at,
-        "updated_at": row[0].updated_at,
-        "type": {
-            "type_name": row[1].type_name
-        }
-    } for row in rows]
-    
-    # 获取所有类型
-    types_result = await db.execute(select(Type))
-    types = types_result.scalars().all()
+    """配置项页面，只渲染第一页"""
+    conditions, match_terms = await _config_filters(db, type_name, key, value, search)
+    page = await fetch_config_page(db, conditions, 0, PAGE_SIZE, None, False, match_terms)
     
     return templates.TemplateResponse(
         "configs.html", 
         {
             "request": request, 
-            "configs": configs,
-            "types": types,
+            "configs": page["configs"],
+            "next_cursor": page["next_cursor"],
             "current_type": type_name
         }
-    )
\ No newline at end of file
+    )
+
+@page_router.get("/configs/data")
+async def configs_page_data(
+    type_name: Optional[str] = None,
+    key: Optional[str] = None,
+    value: Optional[str] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 next_cursor"),
+    limit: int = Query(PAGE_SIZE, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """配置项页面的后续分页数据，筛选条件与页面相同"""
+    conditions, match_terms = await _config_filters(db, type_name, key, value, search)
+    return FastJSONResponse(await fetch_config_page(db, conditions, 0, limit, cursor, False, match_terms))
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""配置数聚合缓存
+
+在内存中保存 type_config_counts 表的内容（每个类型的配置数），首页统计、类型列表与
+配置列表的总数直接从这里读取，不再执行 COUNT(*)。缓存与全局版本号绑定，任意写操作
+使版本号变化后，下一次读取时重新加载这张小表（行数等于类型数），与 configs 表的
+大小无关。
+"""
+
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.revision import revisions
+from app.models.counts import type_config_counts
+
+
+class ConfigAggregates:
+    """类型总数、配置总数与每个类型的配置数"""
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._total_configs = 0
+        # 缓存对应的全局版本号，为 None 时尚未加载
+        self._revision: Optional[int] = None
+
+    async def _refresh(self, db):
+        revision = revisions.global_revision
+        if self._revision == revision:
+            return
+        # 先记录版本号再查询，查询期间发生的写操作会让本次结果在下次读取时重新加载
+        result = await db.execute(select(type_config_counts.c.type_id, type_config_counts.c.config_count))
+        self._counts = dict(result.all())
+        self._total_configs = sum(self._counts.values())
+        self._revision = revision
+
+    async def totals(self, db) -> Tuple[int, int]:
+        """返回 (类型总数, 配置总数)"""
+        await self._refresh(db)
+        return len(self._counts), self._total_configs
+
+    async def type_count(self, db, type_id: int) -> int:
+        """类型下的配置数，类型不存在时为 0"""
+        await self._refresh(db)
+        return self._counts.get(type_id, 0)
+
+
+aggregates = ConfigAggregates()
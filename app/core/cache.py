@@ -0,0 +1,126 @@
+"""配置项读缓存模块
+
+按 (type_name, key) 缓存配置项查询结果，容量有界，支持 LRU 与 TTL 淘汰。
+所有写操作提交成功后需调用 invalidate / invalidate_type 使对应条目失效。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class ConfigCache:
+    """进程内 LRU + TTL 缓存
+
+    仅在事件循环线程内使用，无需加锁。
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # (type_name, key) -> (过期时间, 值)
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        # type_name -> 该类型下已缓存的 key 集合，用于按类型失效
+        self._by_type: Dict[str, Set[str]] = {}
+        # 每次失效时递增，用于丢弃失效前发起的查询结果
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def version(self) -> int:
+        """当前缓存版本号，查询数据库前读取，写入缓存时回传"""
+        return self._version
+
+    def get(self, type_name: str, key: str) -> Optional[Any]:
+        """读取缓存，未命中或已过期时返回 None"""
+        entry = self._data.get((type_name, key))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if self.ttl and expires_at < time.monotonic():
+            self._remove(type_name, key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end((type_name, key))
+        self.hits += 1
+        return value
+
+    def set(self, type_name: str, key: str, value: Any, version: Optional[int] = None):
+        """写入缓存
+
+        若传入的 version 与当前版本不一致，说明查询期间发生过写操作，放弃写入。
+        """
+        if self.maxsize <= 0:
+            return
+        if version is not None and version != self._version:
+            return
+
+        cache_key = (type_name, key)
+        self._data[cache_key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(cache_key)
+        self._by_type.setdefault(type_name, set()).add(key)
+
+        while len(self._data) > self.maxsize:
+            (old_type, old_key), _ = self._data.popitem(last=False)
+            self._discard_index(old_type, old_key)
+            self.evictions += 1
+
+    def invalidate(self, type_name: str, key: str):
+        """使单个配置项缓存失效"""
+        self._version += 1
+        if self._remove(type_name, key):
+            self.invalidations += 1
+
+    def invalidate_type(self, type_name: str):
+        """使某个类型下的所有缓存失效"""
+        self._version += 1
+        for key in self._by_type.pop(type_name, set()):
+            if self._data.pop((type_name, key), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """清空缓存"""
+        self._version += 1
+        self._data.clear()
+        self._by_type.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, type_name: str, key: str) -> bool:
+        if self._data.pop((type_name, key), None) is None:
+            return False
+        self._discard_index(type_name, key)
+        return True
+
+    def _discard_index(self, type_name: str, key: str):
+        keys = self._by_type.get(type_name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_type[type_name]
+
+
+config_cache = ConfigCache(maxsize=settings.CONFIG_CACHE_SIZE, ttl=settings.CONFIG_CACHE_TTL)
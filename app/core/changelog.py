@@ -0,0 +1,119 @@
+"""配置变更日志模块
+
+每个写操作在自身事务中调用 record 追加一条变更记录（操作、类型、键、新值），
+与数据变更一起提交或回滚。GET /api/changes?since=<revision> 据此只返回增量，
+边缘缓存无需全量重新下载。
+
+后台任务按 CHANGE_LOG_MAX_ROWS 与 CHANGE_LOG_MAX_AGE 定期清理最旧的记录，
+清理总是删除一段连续的前缀，因此最早保留记录之前的版本号都已不可用，
+since 早于它的客户端需要全量同步。
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select, text
+
+from app.core.config import settings
+from app.models.change import ConfigChange
+from app.models.database import AsyncSessionLocal
+
+_INSERT_CHANGE = insert(ConfigChange.__table__)
+
+# AUTOINCREMENT 表的最大已分配序号，记录被清理后仍然保留
+_HEAD_REVISION_SQL = text("SELECT seq FROM sqlite_sequence WHERE name = 'config_changes'")
+
+_compaction_task: Optional[asyncio.Task] = None
+
+
+async def record(db, op: str, type_name: str, key: Optional[str] = None, value: Optional[str] = None) -> int:
+    """在当前事务中追加一条变更记录，返回它的版本号"""
+    result = await db.execute(_INSERT_CHANGE, {
+        "op": op,
+        "type_name": type_name,
+        "key": key,
+        "value": value,
+        "created_at": datetime.utcnow(),
+    })
+    return result.inserted_primary_key[0]
+
+
+async def record_many(db, changes: List[Dict[str, Any]]) -> List[int]:
+    """在当前事务中批量追加变更记录，每项包含 op、type_name、key、value，按顺序返回各自的版本号"""
+    if not changes:
+        return []
+    now = datetime.utcnow()
+    await db.execute(_INSERT_CHANGE, [{**change, "created_at": now} for change in changes])
+    # 写事务独占数据库，同一批记录的版本号连续分配，以最新版本号倒推
+    head = await head_revision(db)
+    return list(range(head - len(changes) + 1, head + 1))
+
+
+async def head_revision(db) -> int:
+    """最新的变更版本号，没有任何变更时为 0"""
+    result = await db.execute(_HEAD_REVISION_SQL)
+    return result.scalar() or 0
+
+
+async def floor_revision(db, head: int) -> int:
+    """已被清理的最大版本号，since 小于它时无法提供完整增量"""
+    result = await db.execute(select(func.min(ConfigChange.revision)))
+    oldest = result.scalar()
+    return oldest - 1 if oldest is not None else head
+
+
+async def compact(db) -> int:
+    """删除超出保留条数或保留时间的最旧记录，返回删除的条数"""
+    head = await head_revision(db)
+    boundary = head - settings.CHANGE_LOG_MAX_ROWS
+
+    if settings.CHANGE_LOG_MAX_AGE > 0:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.CHANGE_LOG_MAX_AGE)
+        result = await db.execute(
+            select(func.max(ConfigChange.revision)).where(ConfigChange.created_at < cutoff)
+        )
+        boundary = max(boundary, result.scalar() or 0)
+
+    if boundary <= 0:
+        return 0
+    result = await db.execute(delete(ConfigChange).where(ConfigChange.revision <= boundary))
+    return result.rowcount
+
+
+async def _compact_periodically(interval: float):
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                deleted = await compact(db)
+                await db.commit()
+            if deleted:
+                logging.info(f"已清理 {deleted} 条旧的配置变更记录")
+        except Exception as e:
+            logging.error(f"清理配置变更记录失败: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_compaction():
+    """启动定期清理任务"""
+    global _compaction_task
+    if settings.CHANGE_LOG_COMPACT_INTERVAL <= 0:
+        return
+    if _compaction_task is None or _compaction_task.done():
+        _compaction_task = asyncio.get_running_loop().create_task(
+            _compact_periodically(settings.CHANGE_LOG_COMPACT_INTERVAL)
+        )
+
+
+async def stop_compaction():
+    """停止定期清理任务"""
+    global _compaction_task
+    if _compaction_task is None:
+        return
+    _compaction_task.cancel()
+    try:
+        await _compaction_task
+    except asyncio.CancelledError:
+        pass
+    _compaction_task = None
@@ -1,10 +1,30 @@
 import os
+from typing import Any, Dict, Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
 # 加载.env文件
 load_dotenv()
 
+# SQLite 参数预设，通过连接事件以 PRAGMA 应用到每个新连接
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # 调优参数：WAL 下读写互不阻塞，synchronous=NORMAL 只在检查点时 fsync
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+    # SQLite 默认行为：回滚日志，每次提交 fsync，读请求会被写事务阻塞
+    "legacy": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+
 class Settings(BaseSettings):
     """应用配置"""
     # 应用名称
@@ -13,12 +33,112 @@ class Settings(BaseSettings):
     # 数据库URL
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./config_center.db")
     
+    # 是否输出 SQL 语句日志，仅用于调试，开启后每条语句都会同步写日志
+    DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
+    
+    # 写连接池大小、允许溢出的连接数与获取连接的超时时间（秒）
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "2"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    
+    # 只读连接池大小与允许溢出的连接数，读吞吐随连接数增长
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "16"))
+    DB_READ_MAX_OVERFLOW: int = int(os.getenv("DB_READ_MAX_OVERFLOW", "16"))
+    
+    # SQLite 参数预设，可选 performance、legacy
+    SQLITE_PROFILE: str = os.getenv("SQLITE_PROFILE", "performance")
+    
+    # 单独覆盖预设中的 SQLite 参数，为空时使用预设值
+    SQLITE_JOURNAL_MODE: Optional[str] = os.getenv("SQLITE_JOURNAL_MODE")
+    SQLITE_SYNCHRONOUS: Optional[str] = os.getenv("SQLITE_SYNCHRONOUS")
+    SQLITE_MMAP_SIZE: Optional[str] = os.getenv("SQLITE_MMAP_SIZE")
+    SQLITE_CACHE_SIZE: Optional[str] = os.getenv("SQLITE_CACHE_SIZE")
+    SQLITE_BUSY_TIMEOUT: Optional[str] = os.getenv("SQLITE_BUSY_TIMEOUT")
+    SQLITE_TEMP_STORE: Optional[str] = os.getenv("SQLITE_TEMP_STORE")
+    
     # 密钥
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     
     # 特权模式
     PRIVILEGE_MODE: bool = os.getenv("PRIVILEGE_MODE", "True").lower() == "true"
     
+    # 配置项读缓存容量（条目数），0 表示关闭缓存
+    CONFIG_CACHE_SIZE: int = int(os.getenv("CONFIG_CACHE_SIZE", "10000"))
+    
+    # 配置项读缓存过期时间（秒），0 表示不过期
+    CONFIG_CACHE_TTL: float = float(os.getenv("CONFIG_CACHE_TTL", "60"))
+    
+    # 是否启用 SQLite FTS5 全文索引加速搜索
+    FTS_ENABLED: bool = os.getenv("FTS_ENABLED", "True").lower() == "true"
+    
+    # 批量导入每个 executemany 批次的行数
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+    
+    # 变更事件订阅者队列长度，写满后断开该订阅者
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "1000"))
+    
+    # 变更事件流心跳间隔（秒）
+    EVENT_HEARTBEAT_INTERVAL: float = float(os.getenv("EVENT_HEARTBEAT_INTERVAL", "15"))
+    
+    # 配置写操作合并提交：每批最多的操作数与收集一批的最长等待时间（秒）
+    WRITE_BATCH_SIZE: int = int(os.getenv("WRITE_BATCH_SIZE", "100"))
+    WRITE_BATCH_DELAY: float = float(os.getenv("WRITE_BATCH_DELAY", "0.002"))
+    
+    # 等待合并提交的写操作队列长度，写满后新请求等待
+    WRITE_QUEUE_SIZE: int = int(os.getenv("WRITE_QUEUE_SIZE", "10000"))
+    
+    # 是否把每个类型的配置编译为快照文件，批量读取时通过 mmap 直接返回
+    SNAPSHOT_ENABLED: bool = os.getenv("SNAPSHOT_ENABLED", "True").lower() == "true"
+    
+    # 快照文件目录
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "./snapshots")
+    
+    # 变更日志保留的最大条数与最长时间（秒），超出的最旧记录被清理
+    CHANGE_LOG_MAX_ROWS: int = int(os.getenv("CHANGE_LOG_MAX_ROWS", "100000"))
+    CHANGE_LOG_MAX_AGE: float = float(os.getenv("CHANGE_LOG_MAX_AGE", "604800"))
+    
+    # 变更日志清理间隔（秒），0 表示不自动清理
+    CHANGE_LOG_COMPACT_INTERVAL: float = float(os.getenv("CHANGE_LOG_COMPACT_INTERVAL", "3600"))
+    
+    # 是否合并同时到达的相同读请求，只执行一次查询与序列化
+    SINGLEFLIGHT_ENABLED: bool = os.getenv("SINGLEFLIGHT_ENABLED", "True").lower() == "true"
+    
+    # 是否记录请求与 SQL 耗时指标并在 /metrics 输出
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    
+    # 是否开启请求级 SQL 分析，开启后记录超出阈值的请求与慢查询，适合在预发环境使用
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "False").lower() == "true"
+    
+    # 单个请求的 SQL 条数超过该值时记为问题请求
+    PROFILE_MAX_QUERIES: int = int(os.getenv("PROFILE_MAX_QUERIES", "20"))
+    
+    # 单个请求的耗时超过该值（毫秒）时记为问题请求
+    PROFILE_MAX_DURATION_MS: float = float(os.getenv("PROFILE_MAX_DURATION_MS", "500"))
+    
+    # 单条 SQL 耗时超过该值（毫秒）时连同查询计划写入日志
+    PROFILE_SLOW_QUERY_MS: float = float(os.getenv("PROFILE_SLOW_QUERY_MS", "100"))
+    
+    # 保留的问题请求数
+    PROFILE_HISTORY_SIZE: int = int(os.getenv("PROFILE_HISTORY_SIZE", "100"))
+    
+    def sqlite_pragmas(self, profile: Optional[str] = None) -> Dict[str, Any]:
+        """合并预设与单独配置的 SQLite 参数，profile 为空时使用 SQLITE_PROFILE"""
+        name = profile or self.SQLITE_PROFILE
+        if name not in SQLITE_PROFILES:
+            raise ValueError(f"未知的 SQLite 参数预设: {name}，可选: {', '.join(SQLITE_PROFILES)}")
+        
+        pragmas = dict(SQLITE_PROFILES[name])
+        overrides = {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
+            "temp_store": self.SQLITE_TEMP_STORE,
+        }
+        pragmas.update({key: value for key, value in overrides.items() if value is not None})
+        return pragmas
+    
     class Config:
         env_file = ".env"
         # 允许额外字段
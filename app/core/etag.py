@@ -0,0 +1,31 @@
+"""条件请求（ETag / If-None-Match）辅助模块
+
+ETag 由类型版本号生成，版本号只在写操作提交后递增，因此读接口可以在查询数据库
+之前就判断客户端缓存是否仍然有效，命中时直接返回 304，跳过查询与序列化。
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """由若干部分拼接生成强 ETag"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """判断请求头 If-None-Match 是否包含给定的 ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match 使用弱比较，忽略 W/ 前缀
+    candidates = (tag.strip() for tag in header.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """若客户端缓存仍然有效则返回 304 响应，否则返回 None"""
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
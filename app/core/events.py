@@ -0,0 +1,75 @@
+"""配置变更事件模块
+
+写操作提交成功后调用 event_hub.publish 发布变更事件：递增类型版本号，
+并把事件投递给所有订阅者。事件中的 revision 是进程内的版本号（与 ETag、watch 相同），
+change_revision 是变更日志的版本号，断线后可据此从 GET /api/changes?since= 补齐。每个订阅者拥有独立的有界队列，队列写满时该订阅者
+被标记为溢出并断开，由客户端重新全量同步，慢消费者不会阻塞写请求或无限占用内存。
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, Optional, Set
+
+from app.core.config import settings
+from app.core.revision import revisions
+
+
+class Subscriber:
+    """事件订阅者"""
+
+    def __init__(self, type_names: Optional[Iterable[str]], maxsize: int):
+        # 为空表示订阅所有类型
+        self.type_names: Optional[Set[str]] = set(type_names) if type_names else None
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def accepts(self, type_name: str) -> bool:
+        return self.type_names is None or type_name in self.type_names
+
+
+class EventHub:
+    """变更事件分发中心"""
+
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+
+    def subscribe(self, type_names: Optional[Iterable[str]] = None) -> Subscriber:
+        """注册订阅者"""
+        subscriber = Subscriber(type_names, self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """注销订阅者"""
+        self._subscribers.discard(subscriber)
+
+    def publish(
+        self,
+        op: str,
+        type_name: str,
+        key: Optional[str] = None,
+        value: Optional[str] = None,
+        change_revision: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """发布变更事件，返回包含新版本号的事件"""
+        event = {
+            "op": op,
+            "type_name": type_name,
+            "key": key,
+            "value": value,
+            "revision": revisions.bump(type_name),
+            "change_revision": change_revision,
+        }
+
+        for subscriber in list(self._subscribers):
+            if not subscriber.accepts(type_name):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self.unsubscribe(subscriber)
+        return event
+
+
+event_hub = EventHub(queue_size=settings.EVENT_QUEUE_SIZE)
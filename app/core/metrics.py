@@ -0,0 +1,262 @@
+"""运行指标模块
+
+记录两类指标，并在 /metrics 以 Prometheus 文本格式输出：
+
+- 每个路由（按路由模板，如 /api/configs/{config_id}）的请求数与请求耗时直方图，
+  由 ASGI 中间件 MetricsMiddleware 记录；
+- 每类 SQL 语句（按操作与表，如 SELECT configs）的执行次数、耗时直方图与
+  影响行数，由 SQLAlchemy 的 before/after_cursor_execute 事件记录。
+
+直方图的桶在创建时固定，记录一次只是一次二分查找与几次整数加法。指标只在事件循环
+线程中修改，不需要加锁。p50/p95/p99 按桶内线性插值估算，与 Prometheus 的
+histogram_quantile 一致，精度取决于桶的划分。
+"""
+
+import re
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+# 单位：秒
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_VERB_PATTERN = re.compile(r"^\s*(\w+)")
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+[\"`]?(\w+)", re.IGNORECASE)
+
+# 按表归类的语句，其余语句（BEGIN、PRAGMA、DDL 等）只按操作归类
+_TABLE_VERBS = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"}
+
+# 语句分类结果的缓存上限，超出后不再缓存，避免动态生成的语句无限占用内存
+_STATEMENT_CACHE_SIZE = 2048
+
+
+class Histogram:
+    """预先分桶的直方图"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        # 最后一个桶对应 +Inf
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """按桶估算分位数，没有样本时返回 None"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if i == len(self.bounds):
+                    # 落在 +Inf 桶时只能给出最大的有限上界
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.bounds[-1]
+
+
+class RouteStats:
+    """单个路由与方法的请求指标"""
+
+    __slots__ = ("latency", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses: Dict[int, int] = {}
+
+
+class StatementStats:
+    """单类 SQL 语句的执行指标"""
+
+    __slots__ = ("latency", "rows")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.rows = 0
+
+
+def classify_statement(statement: str) -> str:
+    """把 SQL 语句归类为“操作 表名”，如 SELECT configs"""
+    match = _VERB_PATTERN.match(statement)
+    if not match:
+        return "OTHER"
+    verb = match.group(1).upper()
+    if verb not in _TABLE_VERBS:
+        return verb
+    match = _TABLE_PATTERN.search(statement)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+class Metrics:
+    """请求与数据库指标的注册表"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        self._statements: Dict[Tuple[str, str], StatementStats] = {}
+        self._statement_labels: Dict[str, str] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        stats = self._routes.get((method, route))
+        if stats is None:
+            stats = self._routes[(method, route)] = RouteStats()
+        stats.latency.observe(seconds)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def observe_statement(self, engine_name: str, statement: str, seconds: float, rows: int):
+        label = self._statement_labels.get(statement)
+        if label is None:
+            label = classify_statement(statement)
+            if len(self._statement_labels) < _STATEMENT_CACHE_SIZE:
+                self._statement_labels[statement] = label
+        stats = self._statements.get((engine_name, label))
+        if stats is None:
+            stats = self._statements[(engine_name, label)] = StatementStats()
+        stats.latency.observe(seconds)
+        if rows > 0:
+            stats.rows += rows
+
+    def instrument_engine(self, engine, name: str):
+        """在引擎上注册语句计时事件，name 作为指标的 engine 标签"""
+        if not self.enabled:
+            return
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context._metrics_started = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_metrics_started", None)
+            if started is not None:
+                # SQLite 在取回结果前无法得知 SELECT 与 RETURNING 的行数，这里只累计写语句的影响行数
+                self.observe_statement(name, statement, time.perf_counter() - started, cursor.rowcount)
+
+    def render(self) -> str:
+        """以 Prometheus 文本格式输出全部指标"""
+        lines = [
+            "# HELP config_center_uptime_seconds 进程启动以来的秒数",
+            "# TYPE config_center_uptime_seconds gauge",
+            f"config_center_uptime_seconds {_format(time.time() - self.started_at)}",
+        ]
+
+        lines.append("# HELP config_center_http_requests_total 按路由、方法与状态码统计的请求数")
+        lines.append("# TYPE config_center_http_requests_total counter")
+        for (method, route), stats in self._routes.items():
+            for status, count in sorted(stats.statuses.items()):
+                labels = _labels(method=method, route=route, status=str(status))
+                lines.append(f"config_center_http_requests_total{{{labels}}} {count}")
+
+        lines.append("# HELP config_center_http_request_duration_seconds 按路由统计的请求耗时")
+        lines.append("# TYPE config_center_http_request_duration_seconds histogram")
+        for (method, route), stats in self._routes.items():
+            _render_histogram(lines, "config_center_http_request_duration_seconds",
+                              _labels(method=method, route=route), stats.latency)
+
+        lines.append("# HELP config_center_http_request_duration_quantile_seconds 按桶估算的请求耗时分位数")
+        lines.append("# TYPE config_center_http_request_duration_quantile_seconds gauge")
+        for (method, route), stats in self._routes.items():
+            _render_quantiles(lines, "config_center_http_request_duration_quantile_seconds",
+                              _labels(method=method, route=route), stats.latency)
+
+        lines.append("# HELP config_center_db_statement_duration_seconds 按语句类别统计的 SQL 执行耗时")
+        lines.append("# TYPE config_center_db_statement_duration_seconds histogram")
+        for (engine_name, label), stats in self._statements.items():
+            _render_histogram(lines, "config_center_db_statement_duration_seconds",
+                              _labels(engine=engine_name, statement=label), stats.latency)
+
+        lines.append("# HELP config_center_db_statement_duration_quantile_seconds 按桶估算的 SQL 执行耗时分位数")
+        lines.append("# TYPE config_center_db_statement_duration_quantile_seconds gauge")
+        for (engine_name, label), stats in self._statements.items():
+            _render_quantiles(lines, "config_center_db_statement_duration_quantile_seconds",
+                              _labels(engine=engine_name, statement=label), stats.latency)
+
+        lines.append("# HELP config_center_db_statement_rows_total 写语句影响的行数")
+        lines.append("# TYPE config_center_db_statement_rows_total counter")
+        for (engine_name, label), stats in self._statements.items():
+            labels = _labels(engine=engine_name, statement=label)
+            lines.append(f"config_center_db_statement_rows_total{{{labels}}} {stats.rows}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """记录每个请求的路由、状态码与耗时的 ASGI 中间件"""
+
+    def __init__(self, app, registry: "Metrics" = None):
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 路由匹配后 FastAPI 会把路由对象写入 scope，按路由模板聚合，避免路径参数导致标签无限增长
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.registry.observe_request(scope["method"], route, status, time.perf_counter() - started)
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return repr(float(value))
+
+
+def _render_histogram(lines: List[str], name: str, labels: str, histogram: Histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{_format(bound)}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {_format(histogram.sum)}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _render_quantiles(lines: List[str], name: str, labels: str, histogram: Histogram):
+    for q in QUANTILES:
+        value = histogram.quantile(q)
+        if value is not None:
+            lines.append(f'{name}{{{labels},quantile="{q}"}} {_format(value)}')
+
+
+metrics = Metrics(enabled=settings.METRICS_ENABLED)
@@ -0,0 +1,133 @@
+"""配置列表查询与游标分页
+
+配置接口与管理页面共用的分页查询：按字段只查询 configs 表的对应列，结果元组直接
+转换为字典，type_name 由类型注册表换算，不关联 types 表。分页游标是上一页最后
+一条记录 ID 的 base64 编码，按 ID 递增的键集分页，翻到深处也不需要 OFFSET 扫描。
+"""
+
+import base64
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, select
+
+from app.core.serialization import rows_to_dicts
+from app.core.type_registry import type_registry
+from app.models import fts
+from app.models.config import Config
+
+# 读接口按列查询，结果元组直接转换为字典后编码，不构建 ORM 对象与 Pydantic 模型
+# 只查询 configs 表，type_name 位置先取 type_id，再由类型注册表换算为名称
+CONFIG_FIELDS = ("key", "value", "key_description", "config_id", "type_id", "created_at", "updated_at", "type_name")
+_CONFIG_COLUMNS = (
+    Config.key, Config.value, Config.key_description, Config.config_id,
+    Config.type_id, Config.created_at, Config.updated_at, Config.type_id.label("type_name")
+)
+
+_COLUMN_BY_FIELD = dict(zip(CONFIG_FIELDS, _CONFIG_COLUMNS))
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """解析 fields 参数，返回需要查询和返回的字段"""
+    if not fields:
+        return CONFIG_FIELDS
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    invalid = [name for name in names if name not in _COLUMN_BY_FIELD]
+    if invalid or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"不支持的字段: {', '.join(invalid)}，可选字段: {', '.join(CONFIG_FIELDS)}"
+        )
+    return names
+
+
+def select_config_rows(fields: Tuple[str, ...] = CONFIG_FIELDS):
+    """
+    只查询 fields 对应的列
+
+    未请求 config_id 时在末尾附加该列供游标分页使用，按 fields 组装结果时会被忽略。
+    """
+    columns = [_COLUMN_BY_FIELD[name] for name in fields]
+    if "config_id" not in fields:
+        columns.append(Config.config_id)
+    return select(*columns).select_from(Config)
+
+
+async def rows_to_configs(db, fields: Tuple[str, ...], rows) -> list:
+    """按 fields 把查询结果转换为字典，type_name 由查询到的 type_id 经类型注册表换算"""
+    configs = rows_to_dicts(fields, rows)
+    if "type_name" in fields:
+        await type_registry.load_names(db, {config["type_name"] for config in configs})
+        for config in configs:
+            config["type_name"] = type_registry.get_name(config["type_name"])
+    return configs
+
+
+def encode_cursor(last_id: int) -> str:
+    """将上一页最后一条记录的ID编码为不透明的分页游标"""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """解析分页游标，返回上一页最后一条记录的ID"""
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+async def fetch_config_page(
+    db,
+    conditions: list,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    with_total: bool,
+    match_terms: Optional[List[str]] = None,
+    ranked: bool = False,
+    fields: Tuple[str, ...] = CONFIG_FIELDS
+) -> dict:
+    """
+    按 config_id 顺序查询一页配置
+
+    传入 cursor 时使用 config_id > 游标 的键集分页，否则使用 skip 偏移分页。
+    多取一条用于判断是否还有下一页。
+    match_terms 非空时关联全文索引表过滤；ranked 为真且未传 cursor 时按相关度排序，
+    此时只能使用 skip 翻页，不返回 next_cursor。
+    """
+    fts_query = " AND ".join(match_terms) if match_terms else None
+
+    def apply_filters(query):
+        if fts_query:
+            query = query.join(fts.configs_fts, fts.configs_fts.c.rowid == Config.config_id)
+            query = query.where(fts.configs_fts_match.match(fts_query))
+        if conditions:
+            query = query.where(and_(*conditions))
+        return query
+
+    total = None
+    if with_total:
+        result = await db.execute(apply_filters(select(func.count()).select_from(Config)))
+        total = result.scalar()
+
+    query = apply_filters(select_config_rows(fields))
+    by_rank = bool(fts_query) and ranked and not cursor
+    if cursor:
+        query = query.where(Config.config_id > decode_cursor(cursor))
+    else:
+        query = query.offset(skip)
+
+    if by_rank:
+        query = query.order_by(fts.configs_fts.c.rank, Config.config_id)
+    else:
+        query = query.order_by(Config.config_id)
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if limit > 0 and len(rows) > limit:
+        rows = rows[:limit]
+        if not by_rank:
+            next_cursor = encode_cursor(rows[-1].config_id)
+
+    return {"configs": await rows_to_configs(db, fields, rows), "total": total, "next_cursor": next_cursor}
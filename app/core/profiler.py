@@ -0,0 +1,242 @@
+"""请求级 SQL 分析模块（默认关闭，PROFILING_ENABLED=true 开启）
+
+ProfilingMiddleware 为每个请求创建一份记录并放入 contextvar，引擎上的
+before/after_cursor_execute 事件把每条 SQL 及其耗时记到发起它的请求名下。
+合并提交的写操作在后台任务中执行，提交时由 bind 带上发起请求的记录。
+
+请求的 SQL 条数超过 PROFILE_MAX_QUERIES、耗时超过 PROFILE_MAX_DURATION_MS，
+或包含慢查询时记为问题请求，保留最近 PROFILE_HISTORY_SIZE 个，供
+GET /api/debug/profiles 查看。耗时超过 PROFILE_SLOW_QUERY_MS 的语句连同
+EXPLAIN QUERY PLAN 一起写入日志，用于在预发环境发现 N+1 查询与缺失的索引。
+"""
+
+import logging
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.profiler")
+
+# 只对这些语句执行 EXPLAIN QUERY PLAN
+_EXPLAIN_VERBS = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+# 问题请求中保留的语句条数与语句长度上限
+_MAX_RECORDED_QUERIES = 200
+_MAX_STATEMENT_LENGTH = 1000
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """单个请求执行的 SQL"""
+
+    __slots__ = ("method", "path", "started_at", "queries", "slow_queries")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started_at = datetime.utcnow()
+        self.queries: List[Tuple[str, float]] = []
+        self.slow_queries: List[Dict[str, Any]] = []
+
+
+def _truncate(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > _MAX_STATEMENT_LENGTH:
+        return statement[:_MAX_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+def explain(dbapi_connection, statement: str, parameters) -> Optional[List[str]]:
+    """在同一连接上执行 EXPLAIN QUERY PLAN，返回每个计划步骤的描述"""
+    if not statement.lstrip().upper().startswith(_EXPLAIN_VERBS):
+        return None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN 失败: {e}"]
+    finally:
+        cursor.close()
+
+
+class Profiler:
+    """把 SQL 归属到请求并记录问题请求"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_queries: int = 20,
+        max_duration_ms: float = 500,
+        slow_query_ms: float = 100,
+        history_size: int = 100
+    ):
+        self.enabled = enabled
+        self.max_queries = max_queries
+        self.max_duration_ms = max_duration_ms
+        self.slow_query_ms = slow_query_ms
+        self.offenders: deque = deque(maxlen=history_size)
+        self.requests = 0
+        self.flagged = 0
+        self.slow_queries = 0
+
+    def instrument_engine(self, engine):
+        """在引擎上注册语句归属与慢查询事件"""
+        if not self.enabled:
+            return
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context._profile_started = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_profile_started", None)
+            if started is None:
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            profile = _current.get()
+            if profile is not None:
+                profile.queries.append((statement, elapsed_ms))
+            if elapsed_ms >= self.slow_query_ms:
+                # executemany 的参数是多组，无法直接用于 EXPLAIN
+                plan = None if executemany else explain(conn.connection, statement, parameters)
+                self._record_slow_query(profile, statement, elapsed_ms, plan)
+
+    def _record_slow_query(self, profile: Optional[RequestProfile], statement: str, elapsed_ms: float, plan):
+        self.slow_queries += 1
+        source = f"{profile.method} {profile.path}" if profile is not None else "后台任务"
+        plan_text = "\n".join(f"    {step}" for step in plan) if plan else "    （无）"
+        logger.warning(f"慢查询 {elapsed_ms:.1f}ms（{source}）: {_truncate(statement)}\n  查询计划:\n{plan_text}")
+        if profile is not None:
+            profile.slow_queries.append({
+                "statement": _truncate(statement),
+                "ms": round(elapsed_ms, 3),
+                "plan": plan,
+            })
+
+    def bind(self, op):
+        """让在其他任务中执行的写操作仍把 SQL 记到当前请求名下"""
+        profile = _current.get()
+        if profile is None:
+            return op
+
+        async def bound(session):
+            token = _current.set(profile)
+            try:
+                return await op(session)
+            finally:
+                _current.reset(token)
+
+        return bound
+
+    def finish(self, profile: RequestProfile, route: str, status: int, duration_ms: float):
+        """请求结束时检查阈值，超出时记为问题请求"""
+        self.requests += 1
+        reasons = []
+        if len(profile.queries) > self.max_queries:
+            reasons.append("queries")
+        if duration_ms > self.max_duration_ms:
+            reasons.append("duration")
+        if profile.slow_queries:
+            reasons.append("slow_query")
+        if not reasons:
+            return
+
+        self.flagged += 1
+        db_ms = sum(elapsed for _, elapsed in profile.queries)
+        # 相同语句重复执行多次通常是 N+1 查询
+        repeated = [
+            {"statement": _truncate(statement), "count": count}
+            for statement, count in Counter(statement for statement, _ in profile.queries).most_common()
+            if count > 1
+        ]
+        self.offenders.append({
+            "method": profile.method,
+            "path": profile.path,
+            "route": route,
+            "status": status,
+            "started_at": profile.started_at.isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "db_ms": round(db_ms, 3),
+            "query_count": len(profile.queries),
+            "reasons": reasons,
+            "repeated": repeated,
+            "slow_queries": profile.slow_queries,
+            "queries": [
+                {"statement": _truncate(statement), "ms": round(elapsed, 3)}
+                for statement, elapsed in profile.queries[:_MAX_RECORDED_QUERIES]
+            ],
+        })
+        logger.warning(
+            f"问题请求 {profile.method} {profile.path}: {len(profile.queries)} 条 SQL，"
+            f"SQL 耗时 {db_ms:.1f}ms，总耗时 {duration_ms:.1f}ms（{', '.join(reasons)}）"
+        )
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """最近的问题请求，最新的在前"""
+        offenders = list(reversed(self.offenders))
+        return offenders[:limit] if limit else offenders
+
+    def clear(self):
+        self.offenders.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_queries": self.max_queries,
+            "max_duration_ms": self.max_duration_ms,
+            "slow_query_ms": self.slow_query_ms,
+            "requests": self.requests,
+            "flagged": self.flagged,
+            "slow_queries": self.slow_queries,
+        }
+
+
+class ProfilingMiddleware:
+    """为每个请求创建 SQL 记录的 ASGI 中间件"""
+
+    def __init__(self, app, registry: "Profiler" = None):
+        self.app = app
+        self.registry = registry or profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.registry.finish(profile, route, status, (time.perf_counter() - started) * 1000)
+
+
+profiler = Profiler(
+    enabled=settings.PROFILING_ENABLED,
+    max_queries=settings.PROFILE_MAX_QUERIES,
+    max_duration_ms=settings.PROFILE_MAX_DURATION_MS,
+    slow_query_ms=settings.PROFILE_SLOW_QUERY_MS,
+    history_size=settings.PROFILE_HISTORY_SIZE
+)
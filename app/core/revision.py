@@ -0,0 +1,74 @@
+"""配置版本号模块
+
+为每个类型维护单调递增的版本号，所有写操作提交成功后调用 bump。
+各类型的版本号取自同一个全局计数器，因此多个类型的最大版本号也可以作为
+一个整体的版本号使用。watch 接口通过 asyncio Future 挂起等待，不轮询数据库。
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, Optional, Set
+
+
+class RevisionRegistry:
+    """按类型记录版本号并唤醒等待者"""
+
+    def __init__(self, base: Optional[int] = None):
+        # 以启动时间（微秒）作为初始版本号，保证进程重启后版本号不会回退
+        self._base = base if base is not None else time.time_ns() // 1000
+        self._global = self._base
+        self._revisions: Dict[str, int] = {}
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+
+    @property
+    def global_revision(self) -> int:
+        """所有类型中最新的版本号"""
+        return self._global
+
+    def current(self, type_name: str) -> int:
+        """获取类型的当前版本号，未发生过写操作的类型返回初始版本号"""
+        return self._revisions.get(type_name, self._base)
+
+    def bump(self, type_name: str) -> int:
+        """递增类型版本号并唤醒该类型上的等待者"""
+        self._global += 1
+        self._revisions[type_name] = self._global
+
+        for waiter in self._waiters.pop(type_name, ()):
+            if not waiter.done():
+                waiter.set_result(self._global)
+        return self._global
+
+    def latest(self, type_names: Iterable[str]) -> int:
+        """多个类型中最大的版本号"""
+        return max((self.current(name) for name in type_names), default=self._base)
+
+    async def wait(self, type_names: Iterable[str], revision: Optional[int], timeout: float) -> bool:
+        """等待任一类型的版本号与客户端已知的版本号不同
+
+        返回 True 表示发生了变化，False 表示等待超时。
+        """
+        type_names = list(type_names)
+        if revision is None or self.latest(type_names) != revision:
+            return True
+        if timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        for name in type_names:
+            self._waiters.setdefault(name, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            for name in type_names:
+                waiters = self._waiters.get(name)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[name]
+
+
+revisions = RevisionRegistry()
@@ -0,0 +1,45 @@
+"""快速 JSON 序列化模块
+
+热点读接口直接把查询出的列元组编码为 JSON 字节，跳过逐行构建 Pydantic 模型、
+response_model 校验与 jsonable_encoder。安装了 orjson 时使用 orjson 编码，
+否则回退到标准库 json。
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Sequence
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+
+def _default(obj: Any):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """将对象编码为 UTF-8 JSON 字节，日期时间输出为 ISO 8601 格式"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def rows_to_dicts(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> list:
+    """按列名把查询结果的元组转换为字典列表"""
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class FastJSONResponse(Response):
+    """使用 dumps 编码的 JSON 响应，返回它的接口不再经过 response_model 校验"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
@@ -0,0 +1,68 @@
+"""并发相同读请求合并模块（singleflight）
+
+同一时刻到达的相同读请求只执行一次查询与序列化：第一个请求启动加载任务，
+其余请求等待同一个任务并共享结果或异常。键由规范化的路由、查询参数与数据版本号
+组成，写操作使版本号变化后到达的请求会启动新的加载，不会拿到旧数据。
+
+加载任务独立于发起它的请求运行，发起请求被取消时其他等待者不受影响，
+因此加载函数需要自行创建数据库会话，不能使用请求依赖注入的会话。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from fastapi import Request
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def flight_key(request: Request, *extra: Hashable) -> tuple:
+    """由路由路径、按名称排序的查询参数与附加部分（如版本号）组成的键"""
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())), *extra)
+
+
+class SingleFlight:
+    """按键合并并发执行的协程"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """执行 func 或等待相同键上正在执行的 func，返回其结果"""
+        if not self.enabled:
+            return await func()
+
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # 所有等待者都已取消时也要取出异常，避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.executions + self.shared
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "shared": self.shared,
+            "shared_rate": round(self.shared / total, 4) if total else 0.0,
+        }
+
+
+singleflight = SingleFlight(enabled=settings.SINGLEFLIGHT_ENABLED)
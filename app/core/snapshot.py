@@ -0,0 +1,241 @@
+"""配置快照模块
+
+把每个类型下的全部配置编译为不可变的快照文件：文件头记录类型信息、构建时的变更日志
+版本号与每个键的值在正文中的偏移，正文是预先序列化好的 {键: 值} JSON 字节。快照以 mmap
+映射，批量读取时直接切片拼接为响应，不查询 SQLite，也不构建字典或 Pydantic 模型。
+
+快照与类型版本号绑定，写操作使版本号递增后快照即失效，下次读取该类型时只重建
+这一个类型。重建先写临时文件再原子替换，旧的映射在不再被引用后自动释放。
+进程重启时检查 config_changes 中该类型在快照版本号之后是否有变更，每个写操作都会
+在自身事务中追加变更记录，没有变更的快照直接复用，作为热启动的数据来源；
+之后的变更记录已被清理而无法确认时重建。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+
+from app.core.config import settings
+from app.core.revision import revisions
+from app.core.serialization import dumps
+from app.core.type_registry import type_registry
+from app.models.change import ConfigChange
+from app.models.config import Config
+
+# 文件格式：魔数 + 8 字节文件头长度 + 文件头 JSON + 正文
+_MAGIC = b"CCSNAP1\n"
+_HEADER_LENGTH = struct.Struct("<Q")
+
+# 变更日志的最新版本号，同 changelog.head_revision；changelog 依赖数据库模块，这里不能导入
+_CHANGE_HEAD_SQL = text("SELECT seq FROM sqlite_sequence WHERE name = 'config_changes'")
+
+
+def encode_namespace(rows: Iterable[Tuple[str, str]]) -> Tuple[bytes, Dict[str, Tuple[int, int]]]:
+    """把 (键, 值) 编码为 {键: 值} JSON 字节，同时返回每个值的 (偏移, 长度)"""
+    parts = [b"{"]
+    index = {}
+    position = 1
+    for key, value in rows:
+        if position > 1:
+            parts.append(b",")
+            position += 1
+        encoded_key = dumps(key) + b":"
+        encoded_value = dumps(value)
+        parts.append(encoded_key)
+        parts.append(encoded_value)
+        position += len(encoded_key)
+        index[key] = (position, len(encoded_value))
+        position += len(encoded_value)
+    parts.append(b"}")
+    return b"".join(parts), index
+
+
+class Snapshot:
+    """一个类型的只读快照，正文通过 mmap 访问"""
+
+    def __init__(self, path: str, header: Dict[str, Any], body_offset: int, mapped: mmap.mmap):
+        self.path = path
+        self.type_name: str = header["type_name"]
+        # 构建前的变更日志版本号，旧格式的快照没有该字段
+        self.change_revision: Optional[int] = header.get("change_revision")
+        self.index: Dict[str, list] = header["index"]
+        self.size = len(mapped)
+        self._body_offset = body_offset
+        self._mapped = mapped
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"不是配置快照文件: {path}")
+        start = len(_MAGIC) + _HEADER_LENGTH.size
+        (header_length,) = _HEADER_LENGTH.unpack(mapped[len(_MAGIC):start])
+        header = json.loads(mapped[start:start + header_length])
+        return cls(path, header, start + header_length, mapped)
+
+    def body(self) -> bytes:
+        """整个类型的 {键: 值} JSON 字节"""
+        return self._mapped[self._body_offset:self.size]
+
+    def value(self, key: str) -> Optional[bytes]:
+        """单个值的 JSON 字节，键不存在返回 None"""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        start = self._body_offset + entry[0]
+        return self._mapped[start:start + entry[1]]
+
+
+class SnapshotStore:
+    """按类型管理快照文件"""
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self._snapshots: Dict[str, Snapshot] = {}
+        # 快照生效时对应的类型版本号，版本号变化后快照失效
+        self._revisions: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.builds = 0
+        self.warm_loaded = 0
+
+    def _path(self, type_name: str) -> str:
+        digest = hashlib.sha1(type_name.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.snap")
+
+    def get(self, type_name: str) -> Optional[Snapshot]:
+        """获取仍然有效的快照"""
+        snapshot = self._snapshots.get(type_name)
+        if snapshot is None or self._revisions.get(type_name) != revisions.current(type_name):
+            return None
+        return snapshot
+
+    async def load(self, db, type_name: str, type_id: int) -> Snapshot:
+        """获取类型的快照，失效时从数据库重建"""
+        snapshot = self.get(type_name)
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+
+        lock = self._locks.setdefault(type_name, asyncio.Lock())
+        async with lock:
+            snapshot = self.get(type_name)
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+
+            # 先记录版本号再查询，查询期间发生的写操作会让本次快照立即失效，
+            # 重启后也会因为变更日志中有更新的记录而重建
+            revision = revisions.current(type_name)
+            change_revision = (await db.execute(_CHANGE_HEAD_SQL)).scalar() or 0
+            result = await db.execute(
+                select(Config.key, Config.value)
+                .where(Config.type_id == type_id)
+                .order_by(Config.key)
+            )
+            rows = result.all()
+            snapshot = await asyncio.to_thread(self._build, type_name, change_revision, rows)
+            self._snapshots[type_name] = snapshot
+            self._revisions[type_name] = revision
+            self.builds += 1
+            return snapshot
+
+    def _build(self, type_name: str, change_revision: int, rows: Sequence[Tuple[str, str]]) -> Snapshot:
+        body, index = encode_namespace(rows)
+        header = json.dumps({
+            "type_name": type_name,
+            "change_revision": change_revision,
+            "index": index,
+        }, ensure_ascii=False).encode("utf-8")
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(type_name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(body)
+        os.replace(temp_path, path)
+        return Snapshot.open(path)
+
+    def discard(self, type_name: str):
+        """删除类型的快照，类型被删除后调用"""
+        self._snapshots.pop(type_name, None)
+        self._revisions.pop(type_name, None)
+        try:
+            os.remove(self._path(type_name))
+        except FileNotFoundError:
+            pass
+
+    async def warm_start(self, conn):
+        """加载构建后类型没有任何变更的已有快照，其余快照文件删除"""
+        if not self.enabled or not os.path.isdir(self.directory):
+            return
+
+        # 版本号不小于 floor 的变更记录都还在，更早的快照无法确认是否过期
+        head = (await conn.execute(_CHANGE_HEAD_SQL)).scalar() or 0
+        oldest = (await conn.execute(select(func.min(ConfigChange.revision)))).scalar()
+        floor = oldest - 1 if oldest is not None else head
+
+        candidates = []
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            if not filename.endswith(".snap"):
+                continue
+            try:
+                snapshot = Snapshot.open(path)
+            except (OSError, ValueError) as e:
+                logging.warning(f"无法读取配置快照 {filename}: {e}")
+                os.remove(path)
+                continue
+            if (
+                type_registry.get_id(snapshot.type_name) is None
+                or snapshot.change_revision is None
+                or snapshot.change_revision < floor
+            ):
+                os.remove(path)
+                continue
+            candidates.append(snapshot)
+
+        # 各类型在最早的快照之后的最新变更版本号
+        latest = {}
+        if candidates:
+            since = min(snapshot.change_revision for snapshot in candidates)
+            result = await conn.execute(
+                select(ConfigChange.type_name, func.max(ConfigChange.revision))
+                .where(ConfigChange.revision > since)
+                .group_by(ConfigChange.type_name)
+            )
+            latest = dict(result.all())
+        for snapshot in candidates:
+            name = snapshot.type_name
+            if latest.get(name, 0) > snapshot.change_revision:
+                os.remove(snapshot.path)
+                continue
+            self._snapshots[name] = snapshot
+            self._revisions[name] = revisions.current(name)
+            self.warm_loaded += 1
+        logging.info(f"已从快照文件加载 {self.warm_loaded} 个配置类型")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "snapshots": len(self._snapshots),
+            "bytes": sum(snapshot.size for snapshot in self._snapshots.values()),
+            "hits": self.hits,
+            "builds": self.builds,
+            "warm_loaded": self.warm_loaded,
+        }
+
+
+snapshots = SnapshotStore(settings.SNAPSHOT_DIR, enabled=settings.SNAPSHOT_ENABLED)
@@ -0,0 +1,82 @@
+"""类型名称注册表
+
+在内存中维护 type_name <-> type_id 的双向映射，init_db 启动时全量加载，
+类型的创建、删除以及写接口自动建类型后同步维护。配置接口据此直接以 type_id
+查询 configs 表，返回的类型名称也由 type_id 换算，读配置不再关联 types 表。
+
+注册表不缓存“类型不存在”：未命中时回查数据库并补充，其他进程新建的类型也能查到。
+注册表只登记已提交的类型：写事务中使用 lookup，未命中时在事务中查询但不登记，
+事务可能回滚（合并提交整批回滚后重放），类型在提交后由调用方 add。
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.models.type import Type
+
+
+class TypeRegistry:
+    """类型名称与类型ID的双向映射"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+
+    def load(self, rows: Iterable[Tuple[str, int]]):
+        """以 (type_name, type_id) 列表替换全部映射"""
+        self._ids = dict(rows)
+        self._names = {type_id: type_name for type_name, type_id in self._ids.items()}
+
+    def add(self, type_name: str, type_id: int):
+        """登记类型，需在创建类型的事务提交后调用"""
+        self._ids[type_name] = type_id
+        self._names[type_id] = type_name
+
+    def remove(self, type_name: str):
+        """移除类型，需在删除类型的事务提交后调用"""
+        type_id = self._ids.pop(type_name, None)
+        if type_id is not None:
+            self._names.pop(type_id, None)
+
+    def get_id(self, type_name: str) -> Optional[int]:
+        return self._ids.get(type_name)
+
+    def get_name(self, type_id: int) -> Optional[str]:
+        return self._names.get(type_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    async def resolve(self, db, type_name: str) -> Optional[int]:
+        """获取类型ID，注册表未命中时回查数据库并登记，类型不存在返回 None，供读会话使用"""
+        type_id = self._ids.get(type_name)
+        if type_id is not None:
+            return type_id
+
+        type_id = await self.lookup(db, type_name)
+        if type_id is not None:
+            self.add(type_name, type_id)
+        return type_id
+
+    async def lookup(self, db, type_name: str) -> Optional[int]:
+        """获取类型ID，未命中时在当前事务中查询，结果不登记到注册表，供写事务使用"""
+        type_id = self._ids.get(type_name)
+        if type_id is not None:
+            return type_id
+
+        result = await db.execute(select(Type.type_id).where(Type.type_name == type_name))
+        return result.scalar()
+
+    async def load_names(self, db, type_ids: Iterable[int]):
+        """确保这些类型ID都能用 get_name 换算为名称，注册表缺少的一次性回查数据库，供读会话使用"""
+        missing = [type_id for type_id in type_ids if type_id not in self._names]
+        if not missing:
+            return
+
+        result = await db.execute(select(Type.type_name, Type.type_id).where(Type.type_id.in_(missing)))
+        for type_name, type_id in result.all():
+            self.add(type_name, type_id)
+
+
+type_registry = TypeRegistry()
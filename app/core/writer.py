@@ -0,0 +1,185 @@
+"""配置写操作合并提交模块
+
+SQLite 同一时间只允许一个写事务，且每次提交都要 fsync。并发写请求各自提交时，
+会排队争用写锁，等待超时后报 database is locked。
+
+这里由单个后台任务从队列中取出写操作，每收集 WRITE_BATCH_SIZE 个或等待
+WRITE_BATCH_DELAY 秒后，在同一个事务中依次执行并一次提交。某个操作失败时整批
+回滚后改用 SAVEPOINT 逐个重新执行，只回滚失败的操作，其余操作仍一起提交。
+写操作因此可能被执行两次，不能在操作内部产生数据库之外的副作用。每个请求等待
+自己的 future，得到自己操作的返回值或异常；提交后才返回。失效缓存、发布事件等
+提交后的副作用放在 after_commit 回调中，由写任务在提交后以操作的返回值调用，
+请求在等待期间被取消（客户端断开、超时）时写入仍会提交，这些副作用也不会被跳过。
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.profiler import profiler
+from app.models.database import AsyncSessionLocal
+
+# 写操作：接收会话，执行语句并返回结果，不自行提交
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+# 提交后的回调：接收写操作的返回值，只在操作成功提交后调用
+AfterCommit = Callable[[Any], None]
+
+# 队列中的一项：写操作、等待结果的 future 与提交后的回调
+_Item = Tuple[WriteOp, asyncio.Future, Optional[AfterCommit]]
+
+
+class WriteCoalescer:
+    """写操作合并提交器"""
+
+    def __init__(self, session_factory, batch_size: int = 100, batch_delay: float = 0.002, queue_size: int = 10000):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.ops = 0
+
+    def start(self):
+        """在当前事件循环中启动后台写任务"""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        """处理完队列中剩余的写操作后停止后台任务"""
+        if self._task is None or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, op: WriteOp, after_commit: Optional[AfterCommit] = None) -> Any:
+        """
+        提交写操作，等待所在批次提交后返回操作的结果，操作失败时抛出其异常
+
+        after_commit 在提交后、返回结果前由写任务调用，调用方不再等待时也会执行。
+        """
+        self.start()
+        future = self._loop.create_future()
+        await self._queue.put((profiler.bind(op), future, after_commit))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "ops": self.ops,
+            "avg_batch_size": round(self.ops / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def _collect(self) -> List[_Item]:
+        """取出一批写操作：至少一个，之后在 batch_delay 内尽量凑满 batch_size"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.batch_delay
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _execute(self, batch: List[_Item], isolate: bool) -> list:
+        """
+        在一个事务中执行整批写操作并提交，按批次顺序返回 (结果, 异常) 列表
+
+        isolate 为 False 时不使用 SAVEPOINT，任一操作失败即抛出异常；
+        为 True 时每个操作使用独立的 SAVEPOINT，失败只回滚该操作。
+        """
+        outcomes = []
+        async with self.session_factory() as session:
+            try:
+                for op, _, _ in batch:
+                    if not isolate:
+                        outcomes.append((await op(session), None))
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            result = await op(session)
+                        outcomes.append((result, None))
+                    except Exception as e:
+                        outcomes.append((None, e))
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        return outcomes
+
+    async def _apply(self, batch: List[_Item]):
+        """
+        执行并提交一批写操作
+
+        先不使用 SAVEPOINT 执行整批，每个 SAVEPOINT 都要额外往返一次数据库线程；
+        有操作失败时回滚整批，再逐个操作使用 SAVEPOINT 重新执行。
+        """
+        try:
+            outcomes = await self._execute(batch, isolate=False)
+        except Exception:
+            try:
+                outcomes = await self._execute(batch, isolate=True)
+            except Exception as e:
+                # 提交失败时整批都未生效
+                logging.error(f"合并提交 {len(batch)} 个写操作失败: {e}")
+                outcomes = [(None, e) for _ in batch]
+
+        self.batches += 1
+        self.ops += len(batch)
+        for (_, future, after_commit), (result, error) in zip(batch, outcomes):
+            if error is None and after_commit is not None:
+                try:
+                    after_commit(result)
+                except Exception as e:
+                    logging.error(f"写操作提交后的回调失败: {e}")
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                await self._apply(batch)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+write_coalescer = WriteCoalescer(
+    AsyncSessionLocal,
+    batch_size=settings.WRITE_BATCH_SIZE,
+    batch_delay=settings.WRITE_BATCH_DELAY,
+    queue_size=settings.WRITE_QUEUE_SIZE
+)
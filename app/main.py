@@ -2,13 +2,17 @@ from fastapi import FastAPI, Request  # 添加 Request 导入
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 import uvicorn
 import logging
 from pathlib import Path
 from app.api.api import api_router
 from app.api.pages import page_router
 from app.core.config import settings
+from app.core import changelog
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.profiler import ProfilingMiddleware
+from app.core.writer import write_coalescer
 from app.models.database import init_db
 
 # 配置日志，确保日志目录存在
@@ -46,6 +50,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 记录每个路由的请求数与耗时
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# 把每条 SQL 记到发起它的请求名下，记录超出阈值的请求
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # 挂载静态文件
 app.mount("/static", StaticFiles(directory=str(Path(__file__).parent / "static")), name="static")
 
@@ -64,15 +76,24 @@ async def root():
     # 将根路径重定向到页面路由的首页
     return RedirectResponse(url="/page/")
 
+# Prometheus 指标
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # 初始化数据库
 @app.on_event("startup")
 async def startup_event():
     await init_db()
     logger.info("数据库初始化完成")
+    changelog.start_compaction()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("应用关闭中...")
+    # 提交队列中尚未写入的配置变更
+    await write_coalescer.stop()
+    await changelog.stop_compaction()
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
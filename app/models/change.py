@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.models.base import Base
+
+class ConfigChange(Base):
+    __tablename__ = "config_changes"
+    
+    # 变更序号即变更日志的版本号，AUTOINCREMENT 保证清理旧记录后序号不会复用
+    revision = Column(Integer, primary_key=True, autoincrement=True)
+    op = Column(String, nullable=False)
+    type_name = Column(String, nullable=False)
+    key = Column(String, nullable=True)
+    value = Column(String, nullable=True)
+    created_at = Column(DateTime, default=func.now(), index=True)
+    
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    def __repr__(self):
+        return f"<ConfigChange(revision={self.revision}, op='{self.op}', type_name='{self.type_name}', key='{self.key}')>"
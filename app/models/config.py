@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, UniqueConstraint
 from sqlalchemy.orm import relationship
-from app.models.database import Base
+from app.models.base import Base
 
 class Config(Base):
     __tablename__ = "configs"
@@ -0,0 +1,74 @@
+"""按类型统计的配置数
+
+type_config_counts 表为每个类型保存一行配置数，由 types 与 configs 表上的触发器
+维护，与写操作在同一个事务中提交或回滚，导入、合并提交以及其他进程的写入都不会
+遗漏。读取类型总数、配置总数与某个类型的配置数不再需要扫描 configs 表。
+"""
+
+import logging
+
+from sqlalchemy import Column, Integer, MetaData, Table, text
+
+# 由 setup_counts 建表，不在 Base.metadata 中
+type_config_counts = Table(
+    "type_config_counts",
+    MetaData(),
+    Column("type_id", Integer, primary_key=True),
+    Column("config_count", Integer, nullable=False),
+)
+
+_COUNTS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS type_config_counts (
+        type_id INTEGER PRIMARY KEY,
+        config_count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS types_counts_ai AFTER INSERT ON types BEGIN
+        INSERT OR IGNORE INTO type_config_counts(type_id, config_count) VALUES (new.type_id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS types_counts_ad AFTER DELETE ON types BEGIN
+        DELETE FROM type_config_counts WHERE type_id = old.type_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS configs_counts_ai AFTER INSERT ON configs BEGIN
+        INSERT INTO type_config_counts(type_id, config_count) VALUES (new.type_id, 1)
+        ON CONFLICT(type_id) DO UPDATE SET config_count = config_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS configs_counts_ad AFTER DELETE ON configs BEGIN
+        UPDATE type_config_counts SET config_count = config_count - 1 WHERE type_id = old.type_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS configs_counts_au AFTER UPDATE OF type_id ON configs
+    WHEN old.type_id != new.type_id BEGIN
+        UPDATE type_config_counts SET config_count = config_count - 1 WHERE type_id = old.type_id;
+        INSERT INTO type_config_counts(type_id, config_count) VALUES (new.type_id, 1)
+        ON CONFLICT(type_id) DO UPDATE SET config_count = config_count + 1;
+    END
+    """,
+]
+
+# 新建统计表时按现有数据一次性回填
+_BACKFILL_SQL = """
+    INSERT INTO type_config_counts(type_id, config_count)
+    SELECT types.type_id, (SELECT count(*) FROM configs WHERE configs.type_id = types.type_id)
+    FROM types
+"""
+
+
+async def setup_counts(conn):
+    """创建统计表与触发器，新建统计表时从现有数据回填"""
+    result = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='type_config_counts'"))
+    exists = result.scalar() is not None
+    for statement in _COUNTS_DDL:
+        await conn.execute(text(statement))
+    if not exists:
+        await conn.execute(text(_BACKFILL_SQL))
+        logging.info("已创建配置数统计表")
@@ -1,17 +1,113 @@
 import logging
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import os
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text, select, inspect
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import event, text, select, inspect
+from sqlalchemy.engine import make_url
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.profiler import profiler
 from app.models.base import Base
 from app.models.type import Type
+from app.models.change import ConfigChange  # noqa: F401  注册 config_changes 表
+from app.models.fts import setup_fts
+from app.models.counts import setup_counts
+from app.core.type_registry import type_registry
+from app.core.snapshot import snapshots
 
 # SQLite异步URL需要使用aiosqlite
 DATABASE_URL = settings.DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# 与参数预设无关、每个新连接都会执行的 PRAGMA：外键约束不属于调优参数，不随预设关闭
+ALWAYS_ON_PRAGMAS: Dict[str, Any] = {"foreign_keys": "ON"}
+
+def build_engine(
+    url: str,
+    pragmas: Dict[str, Any],
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    begin: Optional[str] = None
+) -> AsyncEngine:
+    """
+    创建 SQLite 异步引擎
+    
+    aiosqlite 对文件数据库默认不使用连接池，每个会话都要新建连接和后台线程，
+    这里显式使用队列连接池，并在每个新连接上执行一次 PRAGMA（pragmas 与 ALWAYS_ON_PRAGMAS）。
+    
+    begin 不为空时关闭 sqlite3 驱动的隐式事务管理，由 SQLAlchemy 在事务开始时
+    显式执行该语句（如 BEGIN IMMEDIATE），SAVEPOINT 才能嵌套在外层事务中。
+    """
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size if pool_size is not None else settings.DB_POOL_SIZE,
+        max_overflow=max_overflow if max_overflow is not None else settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in {**pragmas, **ALWAYS_ON_PRAGMAS}.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+        if begin:
+            dbapi_connection.isolation_level = None
+    
+    if begin:
+        @event.listens_for(engine.sync_engine, "begin")
+        def begin_transaction(conn):
+            conn.exec_driver_sql(begin)
+    
+    return engine
+
+def read_only_url(url: str) -> Optional[str]:
+    """
+    把文件数据库 URL 转换为只读 URI（mode=ro），内存数据库无法跨连接共享，返回 None
+    """
+    parsed = make_url(url)
+    if not parsed.database or parsed.database == ":memory:" or parsed.query.get("uri"):
+        return None
+    path = os.path.abspath(parsed.database)
+    return f"{parsed.drivername}:///file:{path}?mode=ro&uri=true"
+
+def read_pragmas(pragmas: Dict[str, Any]) -> Dict[str, Any]:
+    """只读连接的 PRAGMA：去掉需要写数据库文件的日志参数，并禁止写语句"""
+    result = {name: value for name, value in pragmas.items() if name not in ("journal_mode", "synchronous")}
+    result["query_only"] = "ON"
+    return result
+
+# 写引擎：所有写操作经过这个小连接池，SQLite 同一时间只允许一个写事务，
+# 事务开始时即获取写锁，避免读后写升级锁时出现 database is locked
+engine = build_engine(DATABASE_URL, settings.sqlite_pragmas(), begin="BEGIN IMMEDIATE")
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# 读引擎：只读连接池，读请求不再与写事务争用连接；WAL 模式下读写互不阻塞
+READ_DATABASE_URL = read_only_url(DATABASE_URL)
+if READ_DATABASE_URL:
+    read_engine = build_engine(
+        READ_DATABASE_URL,
+        read_pragmas(settings.sqlite_pragmas()),
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW
+    )
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+# 记录每类 SQL 语句的耗时与影响行数，读写引擎分别统计
+metrics.instrument_engine(engine, "write")
+if read_engine is not engine:
+    metrics.instrument_engine(read_engine, "read")
+
+# 开启分析时把每条 SQL 记到发起它的请求名下
+profiler.instrument_engine(engine)
+if read_engine is not engine:
+    profiler.instrument_engine(read_engine)
+
 async def init_db():
     """初始化数据库，创建所有表"""
     try:
@@ -20,25 +116,43 @@ async def init_db():
             # 检查types表是否存在
             result = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='types'"))
             table_exists = result.scalar() is not None
+        
+        # 写连接在事务开始时即获取写锁，需先关闭检查用的连接再建表
+        if not table_exists:
+            # 如果表不存在，创建所有表
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
             
-            if not table_exists:
-                # 如果表不存在，创建所有表
-                async with engine.begin() as conn2:
-                    await conn2.run_sync(Base.metadata.create_all)
+            # 创建默认数据
+            async with AsyncSessionLocal() as session:
+                # 创建默认配置类型
+                default_type = Type(
+                    type_name="default",
+                    description="默认配置类型"
+                )
+                session.add(default_type)
+                await session.commit()
                 
-                # 创建默认数据
-                async with AsyncSessionLocal() as session:
-                    # 创建默认配置类型
-                    default_type = Type(
-                        type_name="default",
-                        description="默认配置类型"
-                    )
-                    session.add(default_type)
-                    await session.commit()
-                    
-                    logging.info("数据库初始化成功，创建了默认配置类型")
-            else:
-                logging.info("数据库表已存在，跳过初始化")
+                logging.info("数据库初始化成功，创建了默认配置类型")
+        else:
+            # 已有数据库只补建新增的表（如 config_changes）
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            logging.info("数据库表已存在，跳过初始化")
+        
+        # 创建或校验全文索引与配置数统计表，已有数据库也会补建
+        async with engine.begin() as conn:
+            await setup_fts(conn)
+            await setup_counts(conn)
+        
+        # 加载类型名称注册表
+        async with engine.connect() as conn:
+            result = await conn.execute(select(Type.type_name, Type.type_id))
+            type_registry.load(result.all())
+            logging.info(f"已加载 {len(type_registry)} 个配置类型")
+            
+            # 复用与数据库一致的快照文件
+            await snapshots.warm_start(conn)
             
     except Exception as e:
         logging.error(f"数据库初始化失败: {e}")
@@ -47,6 +161,14 @@ async def init_db():
 async def get_db():
     """获取数据库会话"""
     db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+async def get_read_db():
+    """获取只读数据库会话，供只查询不写入的接口使用"""
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -0,0 +1,105 @@
+"""配置项全文索引
+
+使用 SQLite FTS5 trigram 分词器在 configs 表的 key、value、key_description 上
+建立外部内容（external content）索引，由触发器在写入时同步，任意子串匹配都可以
+走索引而不必全表扫描 LIKE '%...%'。
+
+trigram 分词器要求检索词至少 3 个字符；更短的检索词以及不支持 FTS5 的 SQLite
+版本由调用方回退到 LIKE 查询。
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, literal_column, text
+
+from app.core.config import settings
+
+# 全文索引表不在 Base.metadata 中，避免 create_all 把它当作普通表创建
+configs_fts = Table(
+    "configs_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("key", String),
+    Column("value", String),
+    Column("key_description", String),
+    Column("rank", Float),
+)
+
+# 在 WHERE 中作为 MATCH 的左操作数，表示匹配整张索引表
+configs_fts_match = literal_column("configs_fts")
+
+# trigram 分词器可检索的最短字符数
+MIN_TERM_LENGTH = 3
+
+_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS configs_fts USING fts5(
+        key, value, key_description,
+        content='configs', content_rowid='config_id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS configs_fts_ai AFTER INSERT ON configs BEGIN
+        INSERT INTO configs_fts(rowid, key, value, key_description)
+        VALUES (new.config_id, new.key, new.value, new.key_description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS configs_fts_ad AFTER DELETE ON configs BEGIN
+        INSERT INTO configs_fts(configs_fts, rowid, key, value, key_description)
+        VALUES ('delete', old.config_id, old.key, old.value, old.key_description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS configs_fts_au AFTER UPDATE ON configs BEGIN
+        INSERT INTO configs_fts(configs_fts, rowid, key, value, key_description)
+        VALUES ('delete', old.config_id, old.key, old.value, old.key_description);
+        INSERT INTO configs_fts(rowid, key, value, key_description)
+        VALUES (new.config_id, new.key, new.value, new.key_description);
+    END
+    """,
+]
+
+_fts_enabled = False
+
+
+def is_enabled() -> bool:
+    """全文索引是否可用"""
+    return _fts_enabled
+
+
+async def setup_fts(conn) -> bool:
+    """创建全文索引表与同步触发器，新建索引时从 configs 表全量重建"""
+    global _fts_enabled
+    if not settings.FTS_ENABLED:
+        _fts_enabled = False
+        return False
+
+    result = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='configs_fts'"))
+    exists = result.scalar() is not None
+    try:
+        for statement in _FTS_DDL:
+            await conn.execute(text(statement))
+        if not exists:
+            await conn.execute(text("INSERT INTO configs_fts(configs_fts) VALUES ('rebuild')"))
+            logging.info("已创建配置项全文索引")
+    except Exception as e:
+        # 旧版本 SQLite 不支持 FTS5 或 trigram 分词器
+        logging.warning(f"全文索引不可用，搜索将回退到 LIKE 查询: {e}")
+        _fts_enabled = False
+        return False
+
+    _fts_enabled = True
+    return True
+
+
+def can_match(term: Optional[str]) -> bool:
+    """检索词能否走全文索引"""
+    return _fts_enabled and term is not None and len(term) >= MIN_TERM_LENGTH
+
+
+def phrase(term: str, column: Optional[str] = None) -> str:
+    """构建 FTS5 短语表达式，column 为空时匹配所有列"""
+    quoted = '"' + term.replace('"', '""') + '"'
+    return f"{column} : {quoted}" if column else quoted
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, func
 from sqlalchemy.orm import relationship
-from app.models.database import Base
+from app.models.base import Base
 
 class Type(Base):
     __tablename__ = "types"
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class ConfigChange(BaseModel):
+    """配置变更记录"""
+    revision: int = Field(..., description="变更版本号")
+    op: str = Field(..., description="操作：create、update、upsert、delete、type_create、type_update、type_delete")
+    type_name: str = Field(..., description="类型名称")
+    key: Optional[str] = Field(None, description="配置键，类型操作为空")
+    value: Optional[str] = Field(None, description="变更后的值，删除操作为空")
+    created_at: Optional[datetime] = Field(None, description="变更时间")
+
+class ConfigChangeList(BaseModel):
+    """增量变更列表"""
+    changes: List[ConfigChange] = Field(default_factory=list, description="since 之后的变更，按版本号升序")
+    revision: int = Field(..., description="下次请求使用的 since")
+    has_more: bool = Field(False, description="是否还有更多变更，为 true 时应立即以 revision 继续拉取")
+    full_sync_required: bool = Field(False, description="since 早于保留的最早变更，需要全量同步后从 revision 开始拉取增量")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from datetime import datetime
 
 class ConfigBase(BaseModel):
@@ -28,10 +28,49 @@ class Config(ConfigInDB):
 
 class ConfigList(BaseModel):
     configs: List[Config]
-    total: int
+    total: Optional[int] = Field(None, description="符合条件的总数，with_total=false 时为空")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，没有更多数据时为空")
 
 class ConfigSearch(BaseModel):
     type_name: Optional[str] = Field(None, description="配置类型名称")
     key: Optional[str] = Field(None, description="配置键")
     value: Optional[str] = Field(None, description="配置值")
-    exact_match: bool = Field(False, description="是否精确匹配")
\ No newline at end of file
+    keyword: Optional[str] = Field(None, description="全文检索词，同时匹配键、值和描述，结果按相关度排序")
+    exact_match: bool = Field(False, description="是否精确匹配")
+
+class ConfigKeyRef(BaseModel):
+    type_name: str = Field(..., description="配置类型名称")
+    key: str = Field(..., description="配置键")
+
+class ConfigMultiGet(BaseModel):
+    items: List[ConfigKeyRef] = Field(..., max_length=1000, description="要批量获取的 (类型, 键) 列表")
+
+class ConfigNamespace(BaseModel):
+    configs: Dict[str, Dict[str, str]] = Field(..., description="类型名称 -> {键: 值}")
+    missing_types: List[str] = Field(default_factory=list, description="不存在的类型名称")
+
+class ConfigMultiGetResult(BaseModel):
+    configs: Dict[str, Dict[str, str]] = Field(..., description="类型名称 -> {键: 值}")
+    missing: List[ConfigKeyRef] = Field(default_factory=list, description="不存在的 (类型, 键)")
+
+class ConfigWatchResult(BaseModel):
+    changed: bool = Field(..., description="等待期间版本号是否发生变化")
+    revision: int = Field(..., description="所监听类型中最新的版本号，作为下次请求的 revision 参数")
+    revisions: Dict[str, int] = Field(..., description="各类型当前的版本号")
+
+class ConfigImportItem(ConfigBase):
+    type_name: str = Field("default", description="配置类型名称")
+
+class ConfigImportRowResult(BaseModel):
+    index: int = Field(..., description="行号，从 0 开始")
+    type_name: Optional[str] = Field(None, description="配置类型名称")
+    key: Optional[str] = Field(None, description="配置键")
+    status: str = Field(..., description="ok：已写入；error：失败；skipped：整体回滚未写入")
+    error: Optional[str] = Field(None, description="失败原因")
+
+class ConfigImportResult(BaseModel):
+    mode: str = Field(..., description="导入模式")
+    total: int = Field(..., description="总行数")
+    succeeded: int = Field(..., description="写入成功的行数")
+    failed: int = Field(..., description="失败的行数")
+    results: List[ConfigImportRowResult] = Field(..., description="逐行结果")
\ No newline at end of file
@@ -0,0 +1,89 @@
+// 表格分页加载：第一页由服务端渲染，之后滚动到表格底部（或点击“加载更多”）时
+// 按游标从页面的 JSON 接口加载下一页并追加到表格中
+function createPager({ tbody, sentinel, button, url, params, cursor, itemsKey, renderRow }) {
+  let nextCursor = cursor || null;
+  let loading = false;
+
+  function update() {
+    button.style.display = nextCursor ? '' : 'none';
+  }
+
+  function sentinelVisible() {
+    return sentinel.getBoundingClientRect().top < window.innerHeight;
+  }
+
+  async function loadMore() {
+    if (!nextCursor || loading) return;
+    loading = true;
+    button.disabled = true;
+    try {
+      const query = new URLSearchParams(params);
+      query.set('cursor', nextCursor);
+      const response = await fetch(`${url}?${query}`);
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || '加载失败');
+      }
+      const page = await response.json();
+      const fragment = document.createDocumentFragment();
+      page[itemsKey].forEach(item => fragment.appendChild(renderRow(item)));
+      tbody.appendChild(fragment);
+      nextCursor = page.next_cursor;
+    } catch (error) {
+      showMessage(error.message, 'danger');
+      nextCursor = null;
+    } finally {
+      loading = false;
+      button.disabled = false;
+      update();
+    }
+    // 一页不足以填满屏幕时继续加载
+    if (nextCursor && sentinelVisible()) {
+      loadMore();
+    }
+  }
+
+  button.addEventListener('click', loadMore);
+  if ('IntersectionObserver' in window) {
+    new IntersectionObserver(entries => {
+      if (entries.some(entry => entry.isIntersecting)) loadMore();
+    }).observe(sentinel);
+  }
+  update();
+}
+
+// 创建带文本内容的单元格，内容作为纯文本插入
+function createCell(text, className) {
+  const cell = document.createElement('td');
+  cell.textContent = text == null ? '' : text;
+  if (className) cell.className = className;
+  return cell;
+}
+
+// 把 ISO 时间格式化为 YYYY-MM-DD HH:MM:SS
+function formatDateTime(value) {
+  return value ? String(value).replace('T', ' ').slice(0, 19) : '';
+}
+
+// 类型输入框的候选项：输入时按名称搜索类型，只取前 20 个
+function attachTypeSuggestions(input, datalist) {
+  let timer = null;
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const query = new URLSearchParams({ search: input.value, limit: 20 });
+      try {
+        const response = await fetch(`/api/types?${query}`);
+        if (!response.ok) return;
+        const data = await response.json();
+        datalist.replaceChildren(...data.types.map(type => {
+          const option = document.createElement('option');
+          option.value = type.type_name;
+          return option;
+        }));
+      } catch (error) {
+        console.error('加载类型候选项失败:', error);
+      }
+    }, 200);
+  });
+}
@@ -0,0 +1 @@
+"""配置中心性能基准测试"""
@@ -0,0 +1,183 @@
+"""合成数据集生成器
+
+生成供 benchmarks.load 使用的 SQLite 数据库：--types 个类型，共 --configs 个配置
+（1k 到 1M），每个类型下的配置数在均值上下浮动。配置值按常见配置的形态混合生成：
+
+- 40% 短标量：整数、布尔值、时长
+- 25% 地址：主机名、URL、连接串
+- 25% 中等长度文本：长度在 --value-size 附近浮动
+- 10% JSON 文档：约为 --value-size 的 4 倍
+
+同一组参数与 --seed 总是生成完全相同的数据，不同提交之间的结果才可以比较。建表使用
+应用的模型，写入后建立全文索引，服务启动时无需再重建。用法::
+
+    python -m benchmarks.dataset --db bench_data/100k.db --types 100 --configs 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.models import fts
+from app.models.base import Base
+from app.models.config import Config
+from app.models.counts import setup_counts
+from app.models.database import build_engine
+from app.models.type import Type
+
+_SECTIONS = ("db", "cache", "http", "mq", "auth", "log", "feature", "limits", "storage", "search")
+_NAMES = (
+    "host", "port", "timeout", "retries", "pool_size", "enabled", "url", "level",
+    "ttl", "max_items", "endpoint", "token", "ratio", "threshold", "whitelist", "options",
+)
+_WORDS = (
+    "alpha", "beta", "gamma", "delta", "primary", "replica", "east", "west", "canary",
+    "stable", "internal", "public", "shard", "cluster", "backup", "default", "legacy", "edge",
+)
+
+
+def make_value(rng: random.Random, value_size: int) -> str:
+    """按常见配置的形态生成一个配置值"""
+    roll = rng.random()
+    if roll < 0.40:
+        kind = rng.randrange(3)
+        if kind == 0:
+            return str(rng.randrange(1, 100000))
+        if kind == 1:
+            return rng.choice(("true", "false"))
+        return f"{rng.randrange(1, 600)}{rng.choice(('ms', 's', 'm'))}"
+    if roll < 0.65:
+        host = f"{rng.choice(_WORDS)}-{rng.randrange(1000)}.{rng.choice(_WORDS)}.svc.cluster.local"
+        kind = rng.randrange(3)
+        if kind == 0:
+            return host
+        if kind == 1:
+            return f"https://{host}:{rng.randrange(1024, 65535)}/api/v{rng.randrange(1, 4)}"
+        return f"postgresql://app:{rng.getrandbits(64):016x}@{host}:5432/{rng.choice(_WORDS)}"
+    if roll < 0.90:
+        length = max(16, int(rng.gauss(value_size, value_size / 4)))
+        text = " ".join(rng.choice(_WORDS) for _ in range(length // 6 + 1))
+        return text[:length]
+    document = {}
+    target = value_size * 4
+    while len(json.dumps(document)) < target:
+        document[f"{rng.choice(_NAMES)}_{len(document)}"] = rng.choice((
+            rng.randrange(100000),
+            rng.random() < 0.5,
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randrange(1, 6))),
+            [rng.choice(_WORDS) for _ in range(rng.randrange(1, 5))],
+        ))
+    return json.dumps(document)
+
+
+def make_key(rng: random.Random, index: int) -> str:
+    """形如 cache.ttl.123 的分层键，index 保证同一类型下唯一"""
+    return f"{rng.choice(_SECTIONS)}.{rng.choice(_NAMES)}.{index}"
+
+
+def distribute(rng: random.Random, total: int, buckets: int) -> list:
+    """把 total 个配置分到 buckets 个类型，每个类型在均值的 50%~150% 之间"""
+    weights = [rng.uniform(0.5, 1.5) for _ in range(buckets)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for i in range(total - sum(counts)):
+        counts[i % buckets] += 1
+    return counts
+
+
+async def generate(args) -> dict:
+    if os.path.exists(args.db):
+        if not args.force:
+            raise SystemExit(f"{args.db} 已存在，使用 --force 覆盖")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    engine = build_engine(f"sqlite+aiosqlite:///{args.db}", settings.sqlite_pragmas("performance"))
+    base_time = datetime(2024, 1, 1)
+    value_bytes = 0
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Type.__table__), [
+            {
+                "type_id": type_id,
+                "type_name": f"service-{type_id:05d}",
+                "description": f"合成数据集类型 {type_id}",
+                "created_at": base_time,
+            }
+            for type_id in range(1, args.types + 1)
+        ])
+
+    rows = []
+    config_id = 0
+    for type_id, count in enumerate(distribute(rng, args.configs, args.types), start=1):
+        for index in range(count):
+            config_id += 1
+            value = make_value(rng, args.value_size)
+            value_bytes += len(value)
+            updated_at = base_time + timedelta(seconds=config_id)
+            rows.append({
+                "config_id": config_id,
+                "type_id": type_id,
+                "key": make_key(rng, index),
+                "value": value,
+                "key_description": None if rng.random() < 0.7 else f"{rng.choice(_WORDS)} {rng.choice(_NAMES)}",
+                "created_at": updated_at,
+                "updated_at": updated_at,
+            })
+            if len(rows) >= args.chunk_size:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(Config.__table__), rows)
+                rows = []
+    if rows:
+        async with engine.begin() as conn:
+            await conn.execute(insert(Config.__table__), rows)
+
+    # 数据写完后一次性建立全文索引与配置数统计，比逐行经触发器同步快得多
+    async with engine.begin() as conn:
+        fts_enabled = await fts.setup_fts(conn)
+        await setup_counts(conn)
+    await engine.dispose()
+
+    return {
+        "db": args.db,
+        "types": args.types,
+        "configs": args.configs,
+        "seed": args.seed,
+        "value_size": args.value_size,
+        "value_bytes": value_bytes,
+        "file_bytes": os.path.getsize(args.db),
+        "fts": fts_enabled,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="生成的数据库文件路径")
+    parser.add_argument("--types", type=int, default=100, help="类型数量")
+    parser.add_argument("--configs", type=int, default=100000, help="配置总数")
+    parser.add_argument("--value-size", type=int, default=256, help="中等长度配置值的平均字节数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="每个事务写入的配置数")
+    parser.add_argument("--force", action="store_true", help="覆盖已存在的数据库文件")
+    args = parser.parse_args()
+    if args.types < 1 or args.configs < args.types:
+        parser.error("需要至少 1 个类型，且配置数不少于类型数")
+
+    print(json.dumps(asyncio.run(generate(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""HTTP 负载测试
+
+在 benchmarks.dataset 生成的数据库上，以 --concurrency 个并发客户端对每个场景
+持续请求 --duration 秒：
+
+- hot_key：按 Zipf 分布读取少量热点键（GET /api/configs/type/{type}/key/{key}）
+- list：按游标逐页遍历类型下的配置（GET /api/configs?type_name=&cursor=）
+- search：按键的子串搜索（GET /api/configs?key=）
+- bulk：读取整个类型的配置（GET /api/configs/bulk）
+- mixed：90% 热点键读取，10% 更新配置（PUT /api/configs/{type}/{key}）
+
+默认在进程内通过 httpx.ASGITransport 直接调用应用；--serve 启动本地 uvicorn，
+--url 指向已运行的服务。mixed 会修改数据库，需要完全一致的数据时请重新生成数据集。
+结果（吞吐、延迟分位数、错误数以及提交与数据集信息）以 JSON 输出，--baseline
+传入之前的结果文件时附带各场景的变化比例。用法::
+
+    python -m benchmarks.dataset --db bench_data/100k.db --configs 100000
+    python -m benchmarks.load --db bench_data/100k.db --output after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+SCENARIOS = ("hot_key", "list", "search", "bulk", "mixed")
+
+# 热点键数量
+_HOT_KEYS = 100
+
+
+class Workload:
+    """从数据集抽样的类型、键与检索词"""
+
+    def __init__(self, db_path: str, seed: int, sample_size: int = 2000):
+        rng = random.Random(seed)
+        conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+        try:
+            self.type_names = [row[0] for row in conn.execute("SELECT type_name FROM types ORDER BY type_id")]
+            self.config_count = conn.execute("SELECT count(*) FROM configs").fetchone()[0]
+            max_id = conn.execute("SELECT max(config_id) FROM configs").fetchone()[0] or 0
+            ids = sorted({rng.randint(1, max_id) for _ in range(sample_size)}) if max_id else []
+            self.keys = conn.execute(
+                f"SELECT t.type_name, c.key FROM configs c JOIN types t ON t.type_id = c.type_id "
+                f"WHERE c.config_id IN ({','.join('?' * len(ids))})",
+                ids
+            ).fetchall() if ids else []
+        finally:
+            conn.close()
+        if not self.keys:
+            raise SystemExit(f"{db_path} 中没有配置，请先运行 python -m benchmarks.dataset")
+
+        rng.shuffle(self.keys)
+        self.hot_keys = self.keys[:_HOT_KEYS]
+        # Zipf 权重：第 n 个热点键的访问概率与 1/n 成正比
+        self.hot_weights = [1 / rank for rank in range(1, len(self.hot_keys) + 1)]
+        # 键的中间一段（如 "ttl.12"），长度不少于 3，可以走全文索引
+        self.search_terms = sorted({key.split(".", 1)[1] for _, key in self.keys})
+
+    def hot_key(self, rng: random.Random):
+        return rng.choices(self.hot_keys, self.hot_weights)[0]
+
+
+class Scenario:
+    """场景：每次调用 next 返回一个 (操作名, 方法, 路径, 参数, 请求体)"""
+
+    def __init__(self, name: str, workload: Workload, rng: random.Random, page_size: int):
+        self.name = name
+        self.workload = workload
+        self.rng = rng
+        self.page_size = page_size
+        self.list_type = None
+        self.cursor = None
+
+    def next(self):
+        return getattr(self, f"_{self.name}")()
+
+    def _hot_key(self):
+        type_name, key = self.workload.hot_key(self.rng)
+        return "read", "GET", f"/api/configs/type/{type_name}/key/{key}", None, None
+
+    def _list(self):
+        if self.list_type is None:
+            self.list_type = self.rng.choice(self.workload.type_names)
+            self.cursor = None
+        params = {"type_name": self.list_type, "limit": self.page_size, "with_total": "false"}
+        if self.cursor:
+            params["cursor"] = self.cursor
+        return "list", "GET", "/api/configs", params, None
+
+    def _search(self):
+        term = self.rng.choice(self.workload.search_terms)
+        return "search", "GET", "/api/configs", {"key": term, "limit": 20, "with_total": "false"}, None
+
+    def _bulk(self):
+        return "bulk", "GET", "/api/configs/bulk", {"type_name": self.rng.choice(self.workload.type_names)}, None
+
+    def _mixed(self):
+        if self.rng.random() < 0.9:
+            return self._hot_key()
+        type_name, key = self.rng.choice(self.workload.keys)
+        return "write", "PUT", f"/api/configs/{type_name}/{key}", None, {"value": f"bench-{self.rng.getrandbits(32):08x}"}
+
+    def observe(self, response: httpx.Response):
+        """根据响应推进场景状态：list 场景取下一页游标，遍历完后换一个类型"""
+        if self.name == "list":
+            self.cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+            if not self.cursor:
+                self.list_type = None
+
+
+def percentiles(latencies: list) -> dict:
+    latencies = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    return {
+        "p50": percentile(0.50),
+        "p90": percentile(0.90),
+        "p99": percentile(0.99),
+        "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, workload: Workload, args) -> dict:
+    latencies = {}
+    errors = {}
+
+    async def worker(index: int, deadline: float, record: bool):
+        scenario = Scenario(name, workload, random.Random(args.seed * 1000 + index), args.page_size)
+        while time.perf_counter() < deadline:
+            operation, method, path, params, body = scenario.next()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+            except Exception as e:
+                if record:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                scenario.observe(httpx.Response(599))
+                continue
+            elapsed = time.perf_counter() - start
+            scenario.observe(response)
+            if not record:
+                continue
+            # 热点键读取可能落到被删除的键以外都应成功，非 2xx 计为错误
+            if response.status_code >= 400:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            else:
+                latencies.setdefault(operation, []).append(elapsed)
+
+    if args.warmup > 0:
+        deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*[worker(i, deadline, False) for i in range(args.concurrency)])
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*[worker(i, deadline, True) for i in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    result = {
+        "scenario": name,
+        "requests": len(all_latencies),
+        "errors": errors,
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        "latency_ms": percentiles(all_latencies),
+    }
+    if len(latencies) > 1:
+        result["operations"] = {
+            operation: {"requests": len(values), "latency_ms": percentiles(values)}
+            for operation, values in sorted(latencies.items())
+        }
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def server_env(args) -> dict:
+    """被测服务的环境变量：使用数据集数据库，快照写到临时目录"""
+    return {
+        "DATABASE_URL": f"sqlite:///{os.path.abspath(args.db)}",
+        "SNAPSHOT_DIR": os.path.join(tempfile.mkdtemp(prefix="load_snapshots_"), "snapshots"),
+        "DB_ECHO": "False",
+    }
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if (await client.get("/api/types", params={"limit": 1})).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() > deadline:
+            raise SystemExit("等待服务启动超时")
+        await asyncio.sleep(0.2)
+
+
+async def run(args, workload: Workload) -> list:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.url or args.serve:
+        process = None
+        base_url = args.url
+        if args.serve:
+            base_url = f"http://127.0.0.1:{args.port}"
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                 "--port", str(args.port), "--log-level", "warning", "--no-access-log"],
+                env={**os.environ, **server_env(args)},
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            )
+        try:
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+                await wait_until_ready(client, args.startup_timeout)
+                return [await run_scenario(client, name, workload, args) for name in args.scenario]
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    # 进程内：设置环境变量后再导入应用，使其连接数据集数据库
+    os.environ.update(server_env(args))
+    from app.main import app
+
+    # 应用配置的日志级别会让 httpx 为每个请求输出一行日志，影响测量结果
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=timeout) as client:
+            return [await run_scenario(client, name, workload, args) for name in args.scenario]
+    finally:
+        await app.router.shutdown()
+
+
+def compare(results: list, baseline_path: str) -> dict:
+    """与之前的结果比较，返回各场景吞吐与 p99 的变化比例（正数表示增加）"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {result["scenario"]: result for result in baseline.get("results", [])}
+
+    def change(new: float, old: float):
+        return round((new - old) / old * 100, 1) if old else None
+
+    comparison = {"baseline_commit": baseline.get("commit"), "scenarios": {}}
+    for result in results:
+        old = previous.get(result["scenario"])
+        if old is None:
+            continue
+        comparison["scenarios"][result["scenario"]] = {
+            "throughput_change_pct": change(result["throughput_rps"], old["throughput_rps"]),
+            "p50_change_pct": change(result["latency_ms"]["p50"], old["latency_ms"]["p50"]),
+            "p99_change_pct": change(result["latency_ms"]["p99"], old["latency_ms"]["p99"]),
+        }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="benchmarks.dataset 生成的数据库文件，用于抽样与进程内运行")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="要运行的场景，可重复，默认全部")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发客户端数")
+    parser.add_argument("--duration", type=float, default=10, help="每个场景的运行时长（秒）")
+    parser.add_argument("--warmup", type=float, default=1, help="每个场景正式计时前的预热时长（秒）")
+    parser.add_argument("--page-size", type=int, default=50, help="list 场景每页的配置数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--timeout", type=float, default=30, help="单个请求的超时时间（秒）")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="压测已运行的服务，如 http://127.0.0.1:8000")
+    target.add_argument("--serve", action="store_true", help="启动本地 uvicorn 并对其压测")
+    parser.add_argument("--port", type=int, default=8765, help="--serve 时 uvicorn 监听的端口")
+    parser.add_argument("--startup-timeout", type=float, default=60, help="等待服务启动的最长时间（秒）")
+    parser.add_argument("--output", help="把结果写入该 JSON 文件")
+    parser.add_argument("--baseline", help="之前的结果文件，输出中附带变化比例")
+    args = parser.parse_args()
+    # mixed 会写入数据，放在最后，不影响其他场景读取的数据
+    args.scenario = sorted(set(args.scenario or SCENARIOS), key=SCENARIOS.index)
+
+    workload = Workload(args.db, args.seed)
+    results = asyncio.run(run(args, workload))
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "target": args.url or ("uvicorn" if args.serve else "asgi"),
+        "python": platform.python_version(),
+        "dataset": {
+            "db": args.db,
+            "types": len(workload.type_names),
+            "configs": workload.config_count,
+        },
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.baseline:
+        report["comparison"] = compare(results, args.baseline)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""列表接口序列化微基准
+
+对比一页配置（默认 100 行）从查询结果到响应字节的 CPU 耗时：
+
+- legacy：逐行构建 ConfigSchema，经 response_model=ConfigList 校验后由 JSONResponse 编码
+- fast：列元组直接转换为字典，由 FastJSONResponse 编码
+
+不涉及数据库，只衡量序列化本身。用法::
+
+    python -m benchmarks.serialization --rows 100 --repeat 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.pagination import CONFIG_FIELDS
+from app.core import serialization
+from app.core.serialization import FastJSONResponse, rows_to_dicts
+from app.models.config import Config
+from app.models.type import Type  # noqa: F401  注册 Type 映射
+from app.schemas.config import Config as ConfigSchema, ConfigList
+
+
+def make_rows(count: int, value_size: int):
+    """生成 ORM 对象与等价的列元组"""
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    configs = []
+    tuples = []
+    for i in range(count):
+        config = Config(
+            config_id=i + 1, type_id=1, key=f"service.key.{i}", value="v" * value_size,
+            key_description=f"描述 {i}", created_at=now, updated_at=now
+        )
+        configs.append((config, "default"))
+        tuples.append((config.key, config.value, config.key_description, config.config_id,
+                       config.type_id, config.created_at, config.updated_at, "default"))
+    return configs, tuples
+
+
+async def legacy_render(rows, field) -> bytes:
+    """原实现：构建 Pydantic 模型，FastAPI 校验并序列化，再用标准库 json 编码"""
+    configs = [
+        ConfigSchema(
+            config_id=config.config_id,
+            type_id=config.type_id,
+            key=config.key,
+            value=config.value,
+            key_description=config.key_description,
+            created_at=config.created_at,
+            updated_at=config.updated_at,
+            type_name=type_name
+        )
+        for config, type_name in rows
+    ]
+    content = await serialize_response(field=field, response_content={"configs": configs, "total": len(configs)})
+    return JSONResponse(content).body
+
+
+def fast_render(rows) -> bytes:
+    """快速路径：列元组 -> 字典 -> JSON 字节"""
+    page = {"configs": rows_to_dicts(CONFIG_FIELDS, rows), "total": len(rows), "next_cursor": None}
+    return FastJSONResponse(page).body
+
+
+async def measure(func, repeat: int) -> float:
+    """返回单次调用的平均耗时（微秒），func 可以是协程函数"""
+    async def call():
+        result = func()
+        if asyncio.iscoroutine(result):
+            await result
+
+    await call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="每页行数")
+    parser.add_argument("--value-size", type=int, default=64, help="每个配置值的字节数")
+    parser.add_argument("--repeat", type=int, default=2000, help="重复次数")
+    args = parser.parse_args()
+
+    orm_rows, tuple_rows = make_rows(args.rows, args.value_size)
+    field = create_response_field(name="response", type_=ConfigList, mode="serialization")
+
+    legacy = asyncio.run(measure(lambda: legacy_render(orm_rows, field), args.repeat))
+    fast = asyncio.run(measure(lambda: fast_render(tuple_rows), args.repeat))
+
+    print(json.dumps({
+        "rows": args.rows,
+        "value_size": args.value_size,
+        "encoder": "orjson" if serialization.orjson is not None else "json",
+        "legacy_us_per_request": round(legacy, 1),
+        "fast_us_per_request": round(fast, 1),
+        "speedup": round(legacy / fast, 2) if fast else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
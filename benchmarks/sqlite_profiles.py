@@ -0,0 +1,131 @@
+"""SQLite 参数预设读吞吐基准
+
+在临时数据库文件上，对每个预设（见 app.core.config.SQLITE_PROFILES）分别运行：
+
+- 若干读协程：按随机键查询单个配置
+- 若干写协程：按随机键更新配置值，每次更新单独提交
+
+固定时长内统计读写次数、读延迟分位数与锁等待失败次数。读写都经过 build_engine
+创建的引擎与连接池，与服务实际使用的路径一致。用法::
+
+    python -m benchmarks.sqlite_profiles --readers 8 --writers 2 --duration 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import SQLITE_PROFILES, settings
+from app.models.base import Base
+from app.models.config import Config  # noqa: F401  注册 configs 表
+from app.models.database import build_engine
+from app.models.type import Type  # noqa: F401  注册 types 表
+
+_READ_SQL = text('SELECT "key", value, updated_at FROM configs WHERE type_id = 1 AND "key" = :key')
+_WRITE_SQL = text('UPDATE configs SET value = :value, updated_at = :now WHERE type_id = 1 AND "key" = :key')
+
+
+async def seed(engine, rows: int):
+    """建表并写入一个类型与 rows 个配置"""
+    now = datetime.utcnow()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text("INSERT INTO types (type_id, type_name, description, created_at) VALUES (1, 'bench', '', :now)"),
+            {"now": now}
+        )
+        await conn.execute(
+            text('INSERT INTO configs (type_id, "key", value, created_at, updated_at) VALUES (1, :key, :value, :now, :now)'),
+            [{"key": f"key.{i}", "value": "v" * 64, "now": now} for i in range(rows)]
+        )
+
+
+async def run_profile(profile: str, args) -> dict:
+    """在新的临时数据库上运行一个预设，返回统计结果"""
+    directory = tempfile.mkdtemp(prefix="sqlite_profile_")
+    path = os.path.join(directory, "bench.db")
+    engine = build_engine(
+        f"sqlite+aiosqlite:///{path}",
+        settings.sqlite_pragmas(profile),
+        pool_size=args.readers + args.writers,
+        max_overflow=0
+    )
+    await seed(engine, args.rows)
+
+    stats = {"reads": 0, "writes": 0, "busy_errors": 0}
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            key = f"key.{random.randrange(args.rows)}"
+            start = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(_READ_SQL, {"key": key})
+            except OperationalError:
+                stats["busy_errors"] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            stats["reads"] += 1
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            key = f"key.{random.randrange(args.rows)}"
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(_WRITE_SQL, {"key": key, "value": os.urandom(32).hex(), "now": datetime.utcnow()})
+            except OperationalError:
+                stats["busy_errors"] += 1
+                continue
+            stats["writes"] += 1
+
+    await asyncio.gather(*[reader() for _ in range(args.readers)], *[writer() for _ in range(args.writers)])
+    await engine.dispose()
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    return {
+        "profile": profile,
+        "reads_per_second": round(stats["reads"] / args.duration),
+        "writes_per_second": round(stats["writes"] / args.duration),
+        "read_p50_ms": percentile(0.50),
+        "read_p99_ms": percentile(0.99),
+        "busy_errors": stats["busy_errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", action="append", choices=list(SQLITE_PROFILES), help="要测试的预设，可重复，默认全部")
+    parser.add_argument("--rows", type=int, default=10000, help="预置的配置数量")
+    parser.add_argument("--readers", type=int, default=8, help="并发读协程数")
+    parser.add_argument("--writers", type=int, default=2, help="并发写协程数")
+    parser.add_argument("--duration", type=float, default=5, help="每个预设的运行时长（秒）")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_profile(profile, args)) for profile in args.profile or list(SQLITE_PROFILES)]
+    print(json.dumps({
+        "rows": args.rows,
+        "readers": args.readers,
+        "writers": args.writers,
+        "duration": args.duration,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""并发写入合并提交基准
+
+在临时数据库文件上，以 --concurrency 个并发请求共执行 --ops 次配置 upsert：
+
+- direct：每个请求使用自己的连接与事务，各自提交（原实现）
+- coalesced：请求提交给 WriteCoalescer，由单个写任务分批在同一事务中提交
+
+统计总吞吐、单次写入延迟分位数与失败次数（如 database is locked）。用法::
+
+    python -m benchmarks.write_coalescing --profile legacy --concurrency 50 --ops 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints.configs import _UPSERT_CONFIG_SQL
+from app.core.config import SQLITE_PROFILES, settings
+from app.core.writer import WriteCoalescer
+from app.models.base import Base
+from app.models.config import Config  # noqa: F401  注册 configs 表
+from app.models.database import build_engine
+from app.models.type import Type  # noqa: F401  注册 types 表
+
+
+def make_engine(path: str, profile: str, concurrency: int, begin=None):
+    return build_engine(
+        f"sqlite+aiosqlite:///{path}",
+        settings.sqlite_pragmas(profile),
+        pool_size=concurrency,
+        max_overflow=0,
+        begin=begin
+    )
+
+
+async def seed(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text("INSERT INTO types (type_id, type_name, description, created_at) VALUES (1, 'bench', '', :now)"),
+            {"now": datetime.utcnow()}
+        )
+
+
+def upsert(i: int):
+    """返回一次写操作，与 PUT /api/configs/{type_name}/{key} 执行相同的语句"""
+    async def apply(session: AsyncSession):
+        now = datetime.utcnow()
+        result = await session.execute(_UPSERT_CONFIG_SQL, {
+            "type_name": "bench",
+            "key": f"key.{i % 1000}",
+            "value": str(i),
+            "key_description": None,
+            "now": now,
+        })
+        return result.first()
+    return apply
+
+
+async def run_mode(mode: str, args) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix="write_coalescing_"), "bench.db")
+    if mode == "direct":
+        # 原实现：sqlite3 驱动的隐式事务，读后写时才升级为写锁
+        engine = make_engine(path, args.profile, args.concurrency)
+    else:
+        engine = make_engine(path, args.profile, 2, begin="BEGIN IMMEDIATE")
+    await seed(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    coalescer = WriteCoalescer(session_factory, batch_size=args.batch_size, batch_delay=args.batch_delay)
+
+    async def direct(op):
+        async with session_factory() as session:
+            result = await op(session)
+            await session.commit()
+            return result
+
+    submit = direct if mode == "direct" else coalescer.submit
+    latencies = []
+    errors = {}
+    counter = iter(range(args.ops))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await submit(upsert(i))
+            except Exception as e:
+                name = type(e).__name__
+                errors[name] = errors.get(name, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+    await coalescer.stop()
+    await engine.dispose()
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    result = {
+        "mode": mode,
+        "writes_per_second": round(len(latencies) / elapsed),
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "errors": errors,
+    }
+    if mode == "coalesced":
+        result["avg_batch_size"] = coalescer.stats()["avg_batch_size"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=list(SQLITE_PROFILES), default=settings.SQLITE_PROFILE, help="SQLite 参数预设")
+    parser.add_argument("--concurrency", type=int, default=50, help="并发请求数")
+    parser.add_argument("--ops", type=int, default=2000, help="写操作总数")
+    parser.add_argument("--batch-size", type=int, default=settings.WRITE_BATCH_SIZE, help="每批最多的写操作数")
+    parser.add_argument("--batch-delay", type=float, default=settings.WRITE_BATCH_DELAY, help="收集一批的最长等待时间（秒）")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_mode(mode, args)) for mode in ("direct", "coalesced")]
+    print(json.dumps({
+        "profile": args.profile,
+        "concurrency": args.concurrency,
+        "ops": args.ops,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""配置中心 Python 客户端"""
+
+from config_center_client.client import ConfigClient
+
+__all__ = ["ConfigClient"]
@@ -0,0 +1,197 @@
+"""配置中心客户端
+
+在进程内缓存所用类型的全部配置，get 只是一次字典查找，不会等待网络。后台线程
+定期以 If-None-Match 条件请求 GET /api/configs/bulk，配置未变化时服务端返回 304；
+变化后整体替换缓存，并把最后一次成功拉取的配置写入本地文件。启动时先加载本地
+文件，服务可以立即启动，配置中心不可用时继续使用最后一次成功拉取的配置。
+
+用法::
+
+    client = ConfigClient("http://config-center:8000", ["app", "db"], cache_dir="/var/cache/app")
+    client.start()
+    host = client.get("db", "host", "localhost")
+
+进程内测试时可以传入 FastAPI 的 TestClient 作为 http_client，base_url 使用
+http://testserver。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+logger = logging.getLogger("config_center_client")
+
+_EMPTY: Mapping[str, str] = MappingProxyType({})
+
+
+class ConfigClient:
+    """带本地缓存、后台刷新与磁盘兜底的配置中心客户端"""
+
+    def __init__(
+        self,
+        base_url: str,
+        type_names: Iterable[str],
+        cache_dir: Optional[str] = None,
+        refresh_interval: float = 30.0,
+        timeout: float = 5.0,
+        http_client: Any = None,
+        on_change: Optional[Callable[[Dict[str, Dict[str, str]]], None]] = None
+    ):
+        """
+        base_url：配置中心地址；type_names：要缓存的配置类型；
+        cache_dir：本地快照目录，为空时不落盘；refresh_interval：后台刷新间隔（秒）；
+        http_client：带 get(url, params=, headers=, timeout=) 方法的 HTTP 客户端，
+        为空时创建 httpx.Client；on_change：配置更新后以新的 {类型: {键: 值}} 调用。
+        """
+        self.base_url = base_url.rstrip("/")
+        self.type_names = list(dict.fromkeys(type_names))
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.on_change = on_change
+
+        if http_client is None:
+            import httpx
+            http_client = httpx.Client()
+        self._http = http_client
+
+        self._cache_path = None
+        if cache_dir:
+            digest = hashlib.sha1(
+                json.dumps([self.base_url, sorted(self.type_names)]).encode("utf-8")
+            ).hexdigest()[:16]
+            self._cache_path = os.path.join(cache_dir, f"config_center_{digest}.json")
+
+        # 整体替换而不原地修改，读取方无需加锁
+        self._configs: Dict[str, Mapping[str, str]] = {}
+        self._etag: Optional[str] = None
+        self._missing_types: list = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_refresh: Optional[float] = None
+        self.last_error: Optional[Exception] = None
+
+    def start(self, wait: bool = True) -> "ConfigClient":
+        """
+        加载本地快照并启动后台刷新线程
+
+        没有本地快照且 wait 为 True 时，先同步拉取一次（最长 timeout 秒），失败只记录日志；
+        否则由后台线程立即拉取。
+        """
+        fetched = False
+        if not self._load_disk() and wait:
+            self.refresh()
+            fetched = True
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(not fetched,), name="config-center-refresh", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self):
+        """停止后台刷新线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.timeout)
+            self._thread = None
+
+    def __enter__(self) -> "ConfigClient":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, type_name: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        """读取配置值，只查本地缓存"""
+        return self._configs.get(type_name, _EMPTY).get(key, default)
+
+    def get_type(self, type_name: str) -> Mapping[str, str]:
+        """读取类型下的全部配置（只读视图）"""
+        return self._configs.get(type_name, _EMPTY)
+
+    @property
+    def ready(self) -> bool:
+        """是否已有可用的配置（来自服务端或本地快照）"""
+        return bool(self._configs)
+
+    def refresh(self) -> bool:
+        """拉取一次配置，返回配置是否发生变化；请求失败时保留现有配置"""
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        try:
+            response = self._http.get(
+                f"{self.base_url}/api/configs/bulk",
+                params=[("type_name", name) for name in self.type_names],
+                headers=headers,
+                timeout=self.timeout
+            )
+            if response.status_code == 304:
+                self.last_refresh = time.time()
+                self.last_error = None
+                return False
+            if response.status_code != 200:
+                raise RuntimeError(f"配置中心返回 {response.status_code}: {response.text[:200]}")
+            data = response.json()
+        except Exception as e:
+            self.last_error = e
+            logger.warning(f"拉取配置失败，继续使用本地缓存: {e}")
+            return False
+
+        missing_types = data.get("missing_types") or []
+        if missing_types and missing_types != self._missing_types:
+            logger.warning(f"配置中心不存在这些类型: {', '.join(missing_types)}")
+        self._missing_types = missing_types
+        self._apply(data.get("configs", {}), response.headers.get("etag"))
+        self.last_refresh = time.time()
+        self.last_error = None
+        self._save_disk()
+        return True
+
+    def _apply(self, configs: Dict[str, Dict[str, str]], etag: Optional[str]):
+        self._configs = {name: MappingProxyType(dict(values)) for name, values in configs.items()}
+        self._etag = etag
+        if self.on_change is not None:
+            try:
+                self.on_change(configs)
+            except Exception as e:
+                logger.error(f"配置变更回调失败: {e}")
+
+    def _run(self, immediate: bool):
+        if immediate:
+            self.refresh()
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def _load_disk(self) -> bool:
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return False
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取本地配置快照失败: {e}")
+            return False
+        # 本地快照的 ETag 可能已与服务端不一致，不沿用，首次刷新总是拉取完整配置
+        self._apply(data.get("configs", {}), None)
+        return True
+
+    def _save_disk(self):
+        if not self._cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            temp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "base_url": self.base_url,
+                    "saved_at": time.time(),
+                    "configs": {name: dict(values) for name, values in self._configs.items()},
+                }, f, ensure_ascii=False)
+            os.replace(temp_path, self._cache_path)
+        except OSError as e:
+            logger.warning(f"保存本地配置快照失败: {e}")
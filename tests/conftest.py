@@ -0,0 +1,21 @@
+"""测试使用临时目录中的数据库与快照目录，需在导入 app 之前设置环境变量"""
+
+import os
+import tempfile
+
+import pytest
+
+_DATA_DIR = tempfile.mkdtemp(prefix="config_center_test_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'test.db')}"
+os.environ["SNAPSHOT_DIR"] = os.path.join(_DATA_DIR, "snapshots")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def api():
+    """运行在进程内的配置中心，启动时初始化数据库"""
+    with TestClient(app) as client:
+        yield client
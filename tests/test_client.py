@@ -0,0 +1,95 @@
+"""ConfigClient 对进程内运行的配置中心的测试"""
+
+import httpx
+import pytest
+
+from config_center_client import ConfigClient
+
+BASE_URL = "http://testserver"
+
+
+class RecordingClient:
+    """包装 TestClient，记录每次请求的状态码"""
+
+    def __init__(self, client):
+        self.client = client
+        self.status_codes = []
+
+    def get(self, url, **kwargs):
+        response = self.client.get(url, **kwargs)
+        self.status_codes.append(response.status_code)
+        return response
+
+
+def unreachable(request):
+    raise httpx.ConnectError("配置中心不可用", request=request)
+
+
+@pytest.fixture
+def seeded(api):
+    """在独立的类型下写入两个配置，返回类型名称"""
+    def seed(type_name):
+        for key, value in (("host", "db.local"), ("port", "5432")):
+            response = api.put(f"/api/configs/{type_name}/{key}", json={"value": value})
+            assert response.status_code == 200
+        return type_name
+    return seed
+
+
+def test_initial_fetch(api, seeded, tmp_path):
+    type_name = seeded("client-initial")
+    client = ConfigClient(BASE_URL, [type_name, "client-missing"], cache_dir=str(tmp_path), http_client=api)
+
+    assert client.refresh() is True
+    assert client.ready
+    assert client.get(type_name, "host") == "db.local"
+    assert dict(client.get_type(type_name)) == {"host": "db.local", "port": "5432"}
+    assert client.get(type_name, "absent", "fallback") == "fallback"
+    assert client.get("client-missing", "host") is None
+
+
+def test_not_modified_after_if_none_match(api, seeded):
+    type_name = seeded("client-etag")
+    http = RecordingClient(api)
+    client = ConfigClient(BASE_URL, [type_name], http_client=http)
+
+    assert client.refresh() is True
+    assert client.refresh() is False
+    assert http.status_codes == [200, 304]
+    assert client.last_error is None
+    assert client.get(type_name, "port") == "5432"
+
+
+def test_refresh_after_write(api, seeded):
+    type_name = seeded("client-write")
+    changes = []
+    client = ConfigClient(BASE_URL, [type_name], http_client=api, on_change=changes.append)
+    assert client.refresh() is True
+
+    response = api.put(f"/api/configs/{type_name}/host", json={"value": "db.new"})
+    assert response.status_code == 200
+
+    assert client.refresh() is True
+    assert client.get(type_name, "host") == "db.new"
+    assert changes[-1][type_name]["host"] == "db.new"
+
+
+def test_boot_from_disk_when_server_unreachable(api, seeded, tmp_path):
+    type_name = seeded("client-disk")
+    online = ConfigClient(BASE_URL, [type_name], cache_dir=str(tmp_path), http_client=api)
+    assert online.refresh() is True
+
+    offline = ConfigClient(
+        BASE_URL,
+        [type_name],
+        cache_dir=str(tmp_path),
+        refresh_interval=3600,
+        http_client=httpx.Client(transport=httpx.MockTransport(unreachable))
+    )
+    with offline.start():
+        assert offline.ready
+        assert offline.get(type_name, "host") == "db.local"
+
+        assert offline.refresh() is False
+        assert isinstance(offline.last_error, httpx.ConnectError)
+        assert offline.get(type_name, "port") == "5432"
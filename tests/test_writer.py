@@ -0,0 +1,102 @@
+"""写操作合并提交的测试：同一批次中部分操作失败时的逐个重放"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints.configs import create_config
+from app.core.type_registry import type_registry
+from app.core.writer import write_coalescer
+from app.schemas.config import ConfigCreate
+
+
+def run_batch(api, *coroutines):
+    """在应用的事件循环中并发执行，返回结果（异常作为结果返回）与所用的批次数"""
+    async def gather():
+        batches = write_coalescer.batches
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        return results, write_coalescer.batches - batches
+    return api.portal.call(gather)
+
+
+def create(type_name, key, value="v"):
+    return create_config(ConfigCreate(type_name=type_name, key=key, value=value))
+
+
+def test_duplicate_key_fails_alone(api):
+    keys = ["k0", "k1", "k2", "k1", "k3"]
+    results, batches = run_batch(api, *(create("writer-dup", key, f"v{i}") for i, key in enumerate(keys)))
+
+    assert batches == 1
+    assert isinstance(results[3], HTTPException)
+    assert results[3].status_code == 400
+    for i in (0, 1, 2, 4):
+        assert results[i].key == keys[i]
+        assert results[i].value == f"v{i}"
+
+    for i in (0, 1, 2, 4):
+        response = api.get(f"/api/configs/type/writer-dup/key/{keys[i]}")
+        assert response.status_code == 200
+        assert response.json()["value"] == f"v{i}"
+
+
+def test_auto_created_type_survives_replay(api):
+    response = api.post("/api/configs", json={"type_name": "writer-existing", "key": "taken", "value": "v"})
+    assert response.status_code == 200
+
+    results, batches = run_batch(
+        api,
+        create("writer-auto", "a"),
+        create("writer-existing", "taken"),
+        create("writer-auto", "b"),
+    )
+
+    assert batches == 1
+    assert isinstance(results[1], HTTPException)
+    type_id = results[0].type_id
+    assert results[2].type_id == type_id
+    assert type_registry.get_name(type_id) == "writer-auto"
+
+    response = api.get("/api/configs/bulk", params={"type_name": "writer-auto"})
+    assert response.status_code == 200
+    assert response.json()["configs"] == {"writer-auto": {"a": "v", "b": "v"}}
+
+
+def test_each_future_gets_its_own_outcome(api):
+    committed = []
+
+    def op(outcome):
+        async def apply(db):
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return apply
+
+    outcomes = ["first", ValueError("second"), "third", KeyError("fourth")]
+    results, batches = run_batch(
+        api, *(write_coalescer.submit(op(outcome), committed.append) for outcome in outcomes)
+    )
+
+    assert batches == 1
+    assert results == [outcomes[0], outcomes[1], outcomes[2], outcomes[3]]
+    assert committed == ["first", "third"]
+
+
+def test_after_commit_runs_when_caller_cancelled(api):
+    committed = []
+
+    async def apply(db):
+        return "done"
+
+    async def submit_and_cancel():
+        task = asyncio.ensure_future(write_coalescer.submit(apply, committed.append))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # 队列按顺序处理，之后提交的操作完成时被取消的操作已经提交
+        await write_coalescer.submit(apply)
+
+    api.portal.call(submit_and_cancel)
+    assert committed == ["done"]